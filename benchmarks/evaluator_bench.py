@@ -0,0 +1,222 @@
+# benchmarks/evaluator_bench.py
+"""
+Evaluator quality vs. latency benchmark.
+
+Runs evaluate_section1 (persistence disabled) over the golden transcript set
+for each model/temperature configuration and reports:
+  - agreement with the reference scores (MAE over the five sub-scores,
+    share within ±1, pass/fail agreement),
+  - run-to-run variance (mean std-dev of final_score across repeats),
+  - latency p50/p95 of model calls,
+  - token usage and estimated cost.
+
+Modes:
+  live    call Gemini (needs GEMINI_API_KEY)
+  record  call Gemini and save every response to the recordings file
+  replay  answer from the recordings file only (offline, repeatable);
+          the file is not committed, so run --mode record once first
+
+Usage:
+    python benchmarks/evaluator_bench.py --mode record --repeats 3
+    python benchmarks/evaluator_bench.py --mode replay
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules import evaluator, scheduler  # noqa: E402
+
+GOLDEN_PATH = os.path.join(ROOT, "benchmarks", "golden", "section1_v1.json")
+RECORDINGS_PATH = os.path.join(ROOT, "benchmarks", "recordings", "section1_v1.json")
+QUESTIONS_PATH = os.path.join(ROOT, "data", "section1_questions.json")
+
+SCORE_KEYS = ("fluency", "grammar", "vocabulary", "coherence", "relevance")
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class BenchModel:
+    """
+    generate_content() stand-in that times live calls, reads token usage,
+    and records to / replays from a recordings dict keyed by the request.
+    """
+
+    def __init__(self, model_id: str, temperature: float, mode: str, recordings: Dict[str, Any]):
+        self.model_id = model_id
+        self.temperature = temperature
+        self.mode = mode
+        self.recordings = recordings
+        self.repeat = 0
+        self.calls: List[Dict[str, Any]] = []
+        self._live = None
+        if mode != "replay":
+            evaluator._ensure_model()  # configures the API key
+            self._live = evaluator.build_model(model_id, temperature=temperature)
+
+    def _key(self, prompt: str) -> str:
+        raw = f"{self.model_id}|{self.temperature}|{self.repeat}|{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def generate_content(self, prompt: str):
+        key = self._key(prompt)
+        if self.mode == "replay":
+            if key not in self.recordings:
+                raise KeyError(f"No recorded response for {self.model_id} t={self.temperature} repeat={self.repeat}; run --mode record first.")
+            call = self.recordings[key]
+        else:
+            started = time.perf_counter()
+            resp = self._live.generate_content(prompt)
+            usage = getattr(resp, "usage_metadata", None)
+            call = {
+                "text": getattr(resp, "text", "") or "",
+                "latency_s": round(time.perf_counter() - started, 4),
+                "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+                "output_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+            }
+            if self.mode == "record":
+                self.recordings[key] = call
+        self.calls.append(call)
+        return _Response(call["text"])
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_config(model_id: str, temperature: float, repeats: int, mode: str,
+               golden: Dict[str, Any], questions: Dict[int, Dict[str, Any]],
+               recordings: Dict[str, Any]) -> Dict[str, Any]:
+    model = BenchModel(model_id, temperature, mode, recordings)
+    abs_errors, within_one, pass_agree = [], [], []
+    finals = defaultdict(list)
+    failures = 0
+
+    for repeat in range(repeats):
+        model.repeat = repeat
+        for item in golden["items"]:
+            q = questions[item["question_id"]]
+            try:
+                result = evaluator.evaluate_section1(
+                    "benchmark",
+                    item["transcript"],
+                    q["question"],
+                    " | ".join(q["expected_answer"]),
+                    q.get("non_negotiables", ""),
+                    persist=False,
+                    model=model,
+                )
+            except Exception as e:
+                failures += 1
+                print(f"  {model_id} t={temperature} {item['id']}: {e}", file=sys.stderr)
+                continue
+            ref = item["reference"]
+            for k in SCORE_KEYS:
+                err = abs(result[k] - ref[k])
+                abs_errors.append(err)
+                within_one.append(err <= 1)
+            pass_agree.append(result["overall_pass"] == ref["overall_pass"])
+            finals[item["id"]].append(result["final_score"])
+
+    latencies = [c["latency_s"] for c in model.calls]
+    tok_in = sum(c["prompt_tokens"] for c in model.calls)
+    tok_out = sum(c["output_tokens"] for c in model.calls)
+    price_in, price_out = evaluator.MODEL_PRICES.get(model_id, (0.0, 0.0))
+    stds = [statistics.pstdev(v) for v in finals.values() if len(v) > 1]
+
+    return {
+        "model": model_id,
+        "temperature": temperature,
+        "calls": len(model.calls),
+        "failures": failures,
+        "mae": round(statistics.mean(abs_errors), 3) if abs_errors else None,
+        "within_1": round(sum(within_one) / len(within_one), 3) if within_one else None,
+        "pass_agreement": round(sum(pass_agree) / len(pass_agree), 3) if pass_agree else None,
+        "score_std": round(statistics.mean(stds), 3) if stds else 0.0,
+        "latency_p50_s": round(_percentile(latencies, 50), 3),
+        "latency_p95_s": round(_percentile(latencies, 95), 3),
+        "tokens_in": tok_in,
+        "tokens_out": tok_out,
+        "cost_usd": round(tok_in / 1e6 * price_in + tok_out / 1e6 * price_out, 5),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark evaluator models on the golden transcript set.")
+    parser.add_argument("--mode", choices=("live", "record", "replay"), default="replay")
+    parser.add_argument("--models", nargs="+", default=list(evaluator._PREFERRED_MODELS))
+    parser.add_argument("--temperatures", nargs="+", type=float, default=[0.2])
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per item, for run-to-run variance.")
+    parser.add_argument("--golden", default=GOLDEN_PATH)
+    parser.add_argument("--recordings", default=RECORDINGS_PATH)
+    parser.add_argument("--json", dest="json_out", default=None, help="Also write the report as JSON here.")
+    args = parser.parse_args(argv)
+
+    with open(args.golden, "r", encoding="utf-8") as f:
+        golden = json.load(f)
+    with open(QUESTIONS_PATH, "r", encoding="utf-8") as f:
+        questions = {q["id"]: q for q in json.load(f)}
+
+    recordings, recorded_version = {}, None
+    if os.path.exists(args.recordings):
+        with open(args.recordings, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        recordings, recorded_version = saved.get("responses", {}), saved.get("golden_version")
+
+    if args.mode == "replay":
+        if not recordings:
+            print(f"No recorded responses at {os.path.relpath(args.recordings, ROOT)}; replay needs them.\n"
+                  f"Create them once with --mode record (needs GEMINI_API_KEY), or run --mode live.", file=sys.stderr)
+            return 2
+        if recorded_version != golden["version"]:
+            print(f"Recordings are for golden set v{recorded_version}, not v{golden['version']}; "
+                  f"re-run --mode record.", file=sys.stderr)
+            return 2
+
+    if args.mode == "replay":
+        scheduler.configure("llm", rate=1e6, concurrency=1)  # don't throttle recorded responses
+
+    report = [
+        run_config(m, t, args.repeats, args.mode, golden, questions, recordings)
+        for m in args.models
+        for t in args.temperatures
+    ]
+
+    if args.mode == "record":
+        os.makedirs(os.path.dirname(args.recordings), exist_ok=True)
+        with open(args.recordings, "w", encoding="utf-8") as f:
+            json.dump({"golden_version": golden["version"], "responses": recordings}, f, indent=1)
+
+    cols = ("model", "temperature", "mae", "within_1", "pass_agreement", "score_std",
+            "latency_p50_s", "latency_p95_s", "tokens_in", "tokens_out", "cost_usd", "failures")
+    print(f"golden set v{golden['version']} ({len(golden['items'])} items), mode={args.mode}, repeats={args.repeats}")
+    print(f"{cols[0]:<22}" + "  ".join(f"{c:>14}" for c in cols[1:]))
+    for row in report:
+        print(f"{row['model']:<22}" + "  ".join(f"{str(row[c]):>14}" for c in cols[1:]))
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"golden_version": golden["version"], "mode": args.mode, "results": report}, f, indent=2)
+
+    return 1 if any(r["failures"] for r in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
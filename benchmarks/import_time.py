@@ -0,0 +1,152 @@
+# benchmarks/import_time.py
+"""
+Cold-start import benchmark.
+
+Runs the module-level import statements of each page (read from
+pages/*.py with ast, so the list can't drift from the code) in a fresh
+interpreter under `python -X importtime`, repeats a few times, and reports
+the median total plus the slowest top-level imports. Streamlit is imported
+first and not counted: the server has it loaded before any page runs.
+Exits non-zero when a page's imports exceed its budget, so it can gate CI.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 400] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import glob
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES_DIR = os.path.join(ROOT, "pages")
+PRELOADED = "streamlit"  # already imported by the server process before any page loads
+
+DEFAULT_BUDGET_MS = 400
+
+# Pages allowed more than the default. The admin dashboard renders and exports
+# its candidate table with pandas (~400 ms on its own); it is admin-only, so
+# that cost is accepted rather than hidden from the measurement.
+PAGE_BUDGETS_MS = {
+    "5_Admin_Dashboard": 600,
+}
+
+
+class _Skipped(Exception):
+    """The page needs a package that isn't installed in this environment."""
+
+
+def _is_preloaded(module: str) -> bool:
+    return module.split(".")[0] == PRELOADED
+
+
+def _module_level_imports(path: str) -> list:
+    """Import statements a page runs at load; imports inside functions/classes are lazy and skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    statements = []
+
+    def visit(nodes):
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            if isinstance(node, ast.Import):
+                names = [alias for alias in node.names if not _is_preloaded(alias.name)]
+                if names:
+                    statements.append(ast.unparse(ast.Import(names=names)))
+            elif isinstance(node, ast.ImportFrom):
+                if node.level == 0 and node.module != "__future__" and not _is_preloaded(node.module):
+                    statements.append(ast.unparse(node))
+            else:
+                visit(ast.iter_child_nodes(node))  # if/try/with bodies still run at load
+
+    visit(tree.body)
+    return statements
+
+
+def page_imports(pages_dir: str = PAGES_DIR) -> dict:
+    """{page name: [import statement, ...]} for every page, in sidebar order."""
+    return {
+        os.path.splitext(os.path.basename(path))[0]: _module_level_imports(path)
+        for path in sorted(glob.glob(os.path.join(pages_dir, "*.py")))
+    }
+
+
+def _profile(statements: list) -> tuple:
+    """Return (total_ms, {top_level_module: cumulative_ms}) for one fresh import."""
+    preload = importlib.util.find_spec(PRELOADED) is not None
+    code = "\n".join(([f"import {PRELOADED}"] if preload else []) + statements)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed"
+        if not preload and f"No module named '{PRELOADED}'" in last:
+            raise _Skipped(f"{PRELOADED} not installed")
+        raise RuntimeError(last)
+
+    total_us = 0
+    top = {}
+    for line in proc.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        total_us += int(self_us)
+        name = name[1:]
+        if not name.startswith("  "):  # two-space indent marks a nested import
+            top[name.strip()] = int(cum_us) / 1000
+            if preload and name.strip() == PRELOADED:
+                total_us, top = 0, {}  # everything so far was the server's own startup
+    return total_us / 1000, top
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile page import cost with -X importtime.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Per-page cold-start import budget (pages in PAGE_BUDGETS_MS use their own).")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per page (median is reported).")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports to list per page.")
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    for page, statements in page_imports().items():
+        totals, per_module = [], defaultdict(list)
+        try:
+            for _ in range(args.repeat):
+                total, top = _profile(statements)
+                totals.append(total)
+                for name, ms in top.items():
+                    per_module[name].append(ms)
+        except _Skipped as e:
+            print(f"{page:<16} SKIP   {e}")
+            continue
+        except RuntimeError as e:
+            print(f"{page:<16} ERROR  {e}")
+            over_budget.append(page)
+            continue
+
+        budget = PAGE_BUDGETS_MS.get(page, args.budget_ms)
+        median = statistics.median(totals)
+        flag = "OK  " if median <= budget else "OVER"
+        print(f"{page:<16} {flag} {median:8.1f} ms (budget {budget:.0f} ms)")
+        slowest = sorted(((statistics.median(v), k) for k, v in per_module.items()), reverse=True)
+        for ms, name in slowest[: args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+        if median > budget:
+            over_budget.append(page)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# benchmarks/transcribe_batching.py
+"""
+Throughput / latency of the micro-batching Whisper server under concurrency.
+
+For each concurrency level, N client threads each send a number of
+transcription requests back to back. Runs once unbatched (batch size 1,
+no wait) as the baseline and once with the given batching settings, and
+reports requests/s plus p50/p95/max latency.
+
+Usage:
+    python benchmarks/transcribe_batching.py --audio data/sample.wav \
+        --concurrency 1 2 4 8 16 --batch-size 8 --wait-ms 10
+Without --audio a synthetic 10 s clip is used (timing only; the text is noise).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from modules.batch_transcriber import BatchTranscriptionServer  # noqa: E402
+from modules.storage import TARGET_RATE, to_mono_pcm16  # noqa: E402
+
+
+def _load_clips(paths, seconds: float) -> list:
+    if paths:
+        clips = []
+        for p in paths:
+            with open(p, "rb") as f:
+                pcm = to_mono_pcm16(f.read())
+            clips.append(np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0)
+        return clips
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * TARGET_RATE)) / TARGET_RATE
+    clip = 0.1 * np.sin(2 * np.pi * 220 * t) + 0.02 * rng.standard_normal(t.size)
+    return [clip.astype(np.float32)]
+
+
+def _run_level(server: BatchTranscriptionServer, clips: list, clients: int, per_client: int) -> dict:
+    latencies, lock = [], threading.Lock()
+
+    def client(idx: int):
+        for i in range(per_client):
+            clip = clips[(idx + i) % len(clips)]
+            started = time.perf_counter()
+            server.transcribe(clip)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests_per_s": round(len(latencies) / wall, 2),
+        "p50_s": round(statistics.median(ordered), 3),
+        "p95_s": round(ordered[min(len(ordered) - 1, int(0.95 * (len(ordered) - 1) + 0.5))], 3),
+        "max_s": round(ordered[-1], 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark micro-batched Whisper transcription.")
+    parser.add_argument("--audio", nargs="*", default=None, help="WAV files to cycle through.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Synthetic clip length without --audio.")
+    parser.add_argument("--model", default=os.getenv("WHISPER_MODEL", "base.en"))
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=4, help="Requests per client thread.")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--wait-ms", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    clips = _load_clips(args.audio, args.seconds)
+    configs = [("unbatched", 1, 0.0), (f"batch{args.batch_size}/{args.wait_ms:g}ms", args.batch_size, args.wait_ms)]
+
+    print(f"model={args.model} clips={len(clips)} requests/client={args.requests}")
+    print(f"{'config':<18}{'clients':>8}{'req/s':>10}{'p50_s':>9}{'p95_s':>9}{'max_s':>9}{'avg_batch':>11}")
+    for name, batch_size, wait_ms in configs:
+        server = BatchTranscriptionServer(args.model, max_batch_size=batch_size, max_wait_ms=wait_ms, device=args.device).start()
+        server.transcribe(clips[0])  # warm-up
+        for clients in args.concurrency:
+            before = server.stats()
+            row = _run_level(server, clips, clients, args.requests)
+            after = server.stats()
+            batches = after["batches"] - before["batches"]
+            avg_batch = (after["segments"] - before["segments"]) / batches if batches else 0.0
+            print(f"{name:<18}{clients:>8}{row['requests_per_s']:>10}{row['p50_s']:>9}{row['p95_s']:>9}{row['max_s']:>9}{avg_batch:>11.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# db/archive.py
+"""
+Compact, versioned binary encoding for final interview submissions.
+
+Each submission is stored as one self-describing frame:
+
+    magic (3 bytes, b"R1A") | version (1 byte) | length (4 bytes, big-endian) | body
+
+where body is zlib-compressed, whitespace-free JSON. Frames can be
+concatenated into an archive file and decoded one at a time, so bulk
+audits never need the whole archive in memory.
+"""
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterable, Iterator
+
+__all__ = [
+    "FORMAT_VERSION",
+    "encode_submission",
+    "decode_submission",
+    "write_archive",
+    "iter_archive",
+]
+
+FORMAT_VERSION = 1
+
+_MAGIC = b"R1A"
+_HEADER = struct.Struct(">3sBI")
+_COMPRESS_LEVEL = 9
+
+
+def encode_submission(payload: Dict[str, Any]) -> bytes:
+    """Encode one submission dict into a single archive frame."""
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    body = zlib.compress(body, _COMPRESS_LEVEL)
+    return _HEADER.pack(_MAGIC, FORMAT_VERSION, len(body)) + body
+
+
+def _decode_body(version: int, body: bytes) -> Dict[str, Any]:
+    if version == 1:
+        return json.loads(zlib.decompress(body).decode("utf-8"))
+    raise ValueError(f"Unsupported submission archive version: {version}")
+
+
+def _check_header(header: bytes) -> tuple:
+    magic, version, length = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise ValueError("Not a submission archive frame (bad magic).")
+    return version, length
+
+
+def decode_submission(frame: bytes) -> Dict[str, Any]:
+    """Decode a single frame produced by encode_submission."""
+    if len(frame) < _HEADER.size:
+        raise ValueError("Submission archive frame is truncated.")
+    version, length = _check_header(frame[: _HEADER.size])
+    body = frame[_HEADER.size : _HEADER.size + length]
+    if len(body) != length:
+        raise ValueError("Submission archive frame is truncated.")
+    return _decode_body(version, body)
+
+
+def write_archive(fp: BinaryIO, payloads: Iterable[Dict[str, Any]]) -> int:
+    """Append encoded frames for each payload to fp. Returns the number written."""
+    n = 0
+    for payload in payloads:
+        fp.write(encode_submission(payload))
+        n += 1
+    return n
+
+
+def iter_archive(fp: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Stream-decode an archive file, yielding one submission at a time."""
+    while True:
+        header = fp.read(_HEADER.size)
+        if not header:
+            return
+        if len(header) < _HEADER.size:
+            raise ValueError("Submission archive ends with a truncated header.")
+        version, length = _check_header(header)
+        body = fp.read(length)
+        if len(body) != length:
+            raise ValueError("Submission archive ends with a truncated frame.")
+        yield _decode_body(version, body)
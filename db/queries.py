@@ -1,4 +1,5 @@
 from db.supabase_client import supabase
+from db.archive import FORMAT_VERSION, encode_submission, decode_submission
 import json
 
 def save_section1(candidate_id: str, transcripts: list, evaluations: list, final_score: float, status: str):
@@ -19,3 +20,86 @@ def save_section2(candidate_id: str, question_id: str, answer: str, score: float
         "s2_score": score,
         "status": "s2_done"
     }).eq("candidate_id", candidate_id).execute()
+
+
+# Tables written below are defined in db/schema.sql.
+FINAL_SUBMISSION_BATCH_SIZE = 200
+
+
+def _to_bytea(frame: bytes) -> str:
+    # PostgREST takes bytea as a "\\x<hex>" literal; the column stores the raw frame bytes.
+    return "\\x" + frame.hex()
+
+
+def _from_bytea(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+
+
+def save_final_submissions(payloads: list, batch_size: int = FINAL_SUBMISSION_BATCH_SIZE):
+    """
+    Save final submission payloads as compressed archive frames (bytea column),
+    upserting batch_size rows per request. Batching helps bulk callers such as
+    imports and backfills.
+    """
+    rows = []
+    for payload in payloads:
+        frame = encode_submission(payload)
+        rows.append({
+            "candidate_id": payload["candidate_id"],
+            "submitted_at": payload.get("submitted_at"),
+            "format_version": FORMAT_VERSION,
+            "archive": _to_bytea(frame),
+        })
+        if len(rows) >= batch_size:
+            supabase.table("final_submissions").upsert(rows, on_conflict="candidate_id").execute()
+            rows = []
+    if rows:
+        supabase.table("final_submissions").upsert(rows, on_conflict="candidate_id").execute()
+
+
+def save_final_submission(candidate_id: str, final_payload: dict):
+    """
+    Save the full interview submission (Section 1 answers + Section 2 status).
+    Written immediately as a batch of one: buffering live submissions would
+    lose them on a worker restart, which is what this save protects against.
+    """
+    save_final_submissions([{**final_payload, "candidate_id": candidate_id}])
+
+
+def iter_final_submissions(page_size: int = FINAL_SUBMISSION_BATCH_SIZE):
+    """Stream-decode stored submissions page by page, yielding one payload at a time."""
+    start = 0
+    while True:
+        res = (
+            supabase.table("final_submissions")
+            .select("archive")
+            .order("candidate_id")
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        rows = res.data or []
+        for row in rows:
+            yield decode_submission(_from_bytea(row["archive"]))
+        if len(rows) < page_size:
+            return
+        start += page_size
+
+
+def save_rescores(rows: list, batch_size: int = FINAL_SUBMISSION_BATCH_SIZE):
+    """Bulk-upsert re-scoring results (one row per run_id/candidate_id/question_id)."""
+    for i in range(0, len(rows), batch_size):
+        supabase.table("s1_rescores").upsert(
+            rows[i : i + batch_size], on_conflict="run_id,candidate_id,question_id"
+        ).execute()
+
+
+def fetch_candidate_emails(page_size: int = 1000) -> set:
+    """All existing candidate emails (lower-cased), for set-based de-duplication."""
+    emails, start = set(), 0
+    while True:
+        res = supabase.table("candidates").select("email").range(start, start + page_size - 1).execute()
+        rows = res.data or []
+        emails.update(str(r["email"]).strip().lower() for r in rows if r.get("email"))
+        if len(rows) < page_size:
+            return emails
+        start += page_size
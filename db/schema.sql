@@ -0,0 +1,33 @@
+-- db/schema.sql
+-- Tables used by the app beyond the existing `candidates` and `admins`.
+-- Apply once in the Supabase SQL editor (or psql); every statement is idempotent.
+
+-- Final interview submissions (db/queries.py: save_final_submissions).
+-- One row per candidate; `archive` holds the compressed frame from db/archive.py.
+CREATE TABLE IF NOT EXISTS final_submissions (
+    candidate_id   text PRIMARY KEY,            -- upsert target (on_conflict="candidate_id")
+    submitted_at   bigint,                      -- unix seconds, from the payload
+    format_version smallint NOT NULL,           -- db.archive.FORMAT_VERSION at write time
+    archive        bytea NOT NULL
+);
+
+-- Batch re-scoring results (modules/trainer.py via db/queries.py: save_rescores).
+CREATE TABLE IF NOT EXISTS s1_rescores (
+    run_id       text NOT NULL,                 -- --run-id label, e.g. "rubric-v2"
+    candidate_id text NOT NULL,
+    question_id  text NOT NULL,
+    evaluation   text NOT NULL,                 -- JSON-encoded evaluator result
+    final_score  integer,
+    status       text,
+    created_at   timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (run_id, candidate_id, question_id)  -- upsert target
+);
+
+-- Persisted interview progress (modules/session_store.py, SESSION_STORE=supabase).
+CREATE TABLE IF NOT EXISTS interview_sessions (
+    candidate_id  text PRIMARY KEY,             -- upsert target
+    sid           text UNIQUE,                  -- ?sid= URL token, replaced on every login
+    sid_issued_at bigint,                       -- unix seconds; sids older than SESSION_TTL_S are refused
+    state         text NOT NULL DEFAULT '{}',   -- JSON snapshot of PERSISTED_KEYS
+    updated_at    bigint NOT NULL
+);
@@ -1,5 +1,5 @@
 import os
-from supabase import create_client
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,4 +7,19 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+@lru_cache(maxsize=1)
+def get_supabase():
+    """Process-wide Supabase client, created (and the SDK imported) on first use."""
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+class _LazyClient:
+    """Stand-in for the client so `from db.supabase_client import supabase` stays cheap."""
+
+    def __getattr__(self, name):
+        return getattr(get_supabase(), name)
+
+
+supabase = _LazyClient()
@@ -0,0 +1,242 @@
+# modules/batch_transcriber.py
+"""
+In-process micro-batching server for local Whisper speech recognition.
+
+Concurrent sessions hand their audio to one shared server thread. It waits
+up to `max_wait_ms` after the first request for more to arrive (or until
+`max_batch_size` 30-second segments are queued), pads every segment to
+Whisper's 30 s window and decodes the whole batch in a single forward pass
+of a shared model, then resolves each caller's future.
+
+Enable with TRANSCRIBE_BACKEND=whisper. Tuning:
+  WHISPER_MODEL          model name (default "base.en")
+  WHISPER_DEVICE         "cpu" / "cuda" (default: cuda if available)
+  BATCH_MAX_SIZE         segments per forward pass (default 8)
+  BATCH_MAX_WAIT_MS      collection window after the first request (default 10)
+  BATCH_MAX_QUEUE        requests allowed to wait (default 64); further callers
+                         block until there is room
+  BATCH_QUEUE_TIMEOUT_S  how long a caller blocks on a full queue (default 120)
+
+This queue replaces the scheduler's "transcriber" limiter for Whisper (a
+limiter slot per request would cap batches at the limiter's concurrency).
+The server is registered with the scheduler, so queue_position() and
+metrics() report its queue under "transcriber".
+"""
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+__all__ = ["BatchTranscriptionServer", "get_batch_server"]
+
+load_dotenv()
+
+
+class _Request:
+    __slots__ = ("segments", "owner", "future", "enqueued")
+
+    def __init__(self, segments: list, owner: Optional[str] = None):
+        self.segments = segments
+        self.owner = owner
+        self.future: Future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class BatchTranscriptionServer:
+    """Collects transcription requests and decodes them in padded batches."""
+
+    def __init__(self, model_name: str = "base.en", max_batch_size: int = 8,
+                 max_wait_ms: float = 10.0, device: Optional[str] = None,
+                 max_queue: int = 0, queue_timeout_s: Optional[float] = None):
+        self.model_name = model_name
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000.0
+        self.device = device
+        self.max_queue = max(0, int(max_queue))  # 0 = unbounded
+        self.queue_timeout_s = queue_timeout_s
+        self._model = None
+        self._options = None
+        self._queue: "queue.Queue[_Request]" = queue.Queue(maxsize=self.max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._waiting: "deque[_Request]" = deque()  # queued or blocked on a full queue, arrival order
+        self._depth_max = 0
+        self._in_flight = 0
+        self._batches = 0
+        self._segments = 0
+        self._requests = 0
+        self._infer_s = 0.0
+        self._admitted = 0
+        self._wait_s = 0.0
+
+    # -------------------------
+    # Model
+    # -------------------------
+    def _load(self):
+        import torch
+        import whisper
+
+        device = self.device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self._model = whisper.load_model(self.model_name, device=device)
+        self._options = whisper.DecodingOptions(
+            language="en" if self.model_name.endswith(".en") else None,
+            without_timestamps=True,
+            fp16=device == "cuda",
+        )
+
+    def _split(self, samples) -> list:
+        """Cut float32 16 kHz audio into Whisper-sized (30 s) segments."""
+        from whisper.audio import N_SAMPLES
+
+        if len(samples) == 0:
+            return [samples]
+        return [samples[i : i + N_SAMPLES] for i in range(0, len(samples), N_SAMPLES)]
+
+    def _infer(self, segments: list) -> List[str]:
+        import torch
+        import whisper
+
+        mels = [
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(seg), n_mels=self._model.dims.n_mels)
+            for seg in segments
+        ]
+        batch = torch.stack(mels).to(self._model.device)
+        results = whisper.decode(self._model, batch, self._options)
+        return [r.text.strip() for r in results]
+
+    # -------------------------
+    # Server loop
+    # -------------------------
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._load()
+                self._thread = threading.Thread(target=self._loop, name="whisper-batcher", daemon=True)
+                self._thread.start()
+        return self
+
+    def _collect(self) -> List[_Request]:
+        first = self._queue.get()
+        batch, n_segments = [first], len(first.segments)
+        deadline = time.perf_counter() + self.max_wait_s
+        while n_segments < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                req = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(req)
+            n_segments += len(req.segments)
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            now = time.perf_counter()
+            with self._stats_lock:
+                for req in batch:
+                    self._waiting.remove(req)
+                    self._wait_s += now - req.enqueued
+                self._in_flight = len(batch)
+                self._admitted += len(batch)
+            segments = [seg for req in batch for seg in req.segments]
+            try:
+                texts = []
+                started = time.perf_counter()
+                for i in range(0, len(segments), self.max_batch_size):
+                    texts.extend(self._infer(segments[i : i + self.max_batch_size]))
+                elapsed = time.perf_counter() - started
+            except Exception as e:
+                with self._stats_lock:
+                    self._in_flight = 0
+                for req in batch:
+                    req.future.set_exception(e)
+                continue
+
+            pos = 0
+            for req in batch:
+                n = len(req.segments)
+                req.future.set_result(" ".join(t for t in texts[pos : pos + n] if t))
+                pos += n
+            with self._stats_lock:
+                self._in_flight = 0
+                self._batches += 1
+                self._segments += len(segments)
+                self._requests += len(batch)
+                self._infer_s += elapsed
+
+    # -------------------------
+    # Client API
+    # -------------------------
+    def submit(self, samples, owner: Optional[str] = None) -> Future:
+        """
+        Queue float32 mono 16 kHz samples; the future resolves to the transcript.
+        Blocks while the queue is full, raising RuntimeError after queue_timeout_s.
+        owner (the candidate_id) is used for queue-position reporting.
+        """
+        self.start()
+        req = _Request(self._split(samples), owner)
+        with self._stats_lock:
+            self._waiting.append(req)
+            self._depth_max = max(self._depth_max, len(self._waiting))
+        try:
+            self._queue.put(req, timeout=self.queue_timeout_s)
+        except queue.Full:
+            with self._stats_lock:
+                self._waiting.remove(req)
+            raise RuntimeError(f"transcription queue is full ({self.max_queue} waiting), try again shortly")
+        return req.future
+
+    def transcribe(self, samples, timeout: Optional[float] = None, owner: Optional[str] = None) -> str:
+        return self.submit(samples, owner=owner).result(timeout=timeout)
+
+    def position(self, owner: str) -> int:
+        """1-based position of owner's earliest waiting request, 0 if none is waiting."""
+        with self._stats_lock:
+            for i, req in enumerate(self._waiting):
+                if req.owner == owner:
+                    return i + 1
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "requests": self._requests,
+                "segments": self._segments,
+                "avg_batch_segments": round(self._segments / self._batches, 2) if self._batches else 0.0,
+                "avg_infer_s": round(self._infer_s / self._batches, 4) if self._batches else 0.0,
+                "queue_depth": len(self._waiting),
+                "queue_depth_max": self._depth_max,
+                "max_queue": self.max_queue or None,
+                "in_flight": self._in_flight,
+                "concurrency": self.max_batch_size,
+                "admitted": self._admitted,
+                "avg_wait_s": round(self._wait_s / self._admitted, 3) if self._admitted else 0.0,
+            }
+
+    metrics = stats  # scheduler.register_queue() reads metrics()
+
+
+@lru_cache(maxsize=1)
+def get_batch_server() -> BatchTranscriptionServer:
+    """Process-wide server configured from the environment (model loads on first use)."""
+    return BatchTranscriptionServer(
+        model_name=os.getenv("WHISPER_MODEL", "base.en"),
+        max_batch_size=int(os.getenv("BATCH_MAX_SIZE", 8)),
+        max_wait_ms=float(os.getenv("BATCH_MAX_WAIT_MS", 10)),
+        device=os.getenv("WHISPER_DEVICE") or None,
+        max_queue=int(os.getenv("BATCH_MAX_QUEUE", 64)),
+        queue_timeout_s=float(os.getenv("BATCH_QUEUE_TIMEOUT_S", 120)),
+    )
@@ -4,12 +4,15 @@ from __future__ import annotations
 import os
 import json
 import inspect
+import threading
 from typing import Dict, Any, Optional
 
 from dotenv import load_dotenv
 from db.queries import save_section1  # keep import for static tools; real call uses dynamic import
+from modules import scheduler
+from modules.prescore import prescore
 
-__all__ = ["evaluate_section1"]
+__all__ = ["MODEL_PRICES", "evaluate_section1", "build_prompt", "build_model", "default_model_id"]
 
 # -------------------------
 # Internal state (lazy init)
@@ -17,6 +20,7 @@ __all__ = ["evaluate_section1"]
 _GENAI = None
 _MODEL = None
 _MODEL_ID = None
+_INIT_LOCK = threading.Lock()
 
 _PREFERRED_MODELS = (
     "gemini-2.5-pro",        # best reasoning
@@ -24,6 +28,13 @@ _PREFERRED_MODELS = (
     "gemini-2.0-flash-lite", # lightweight fallback
 )
 
+# USD per 1M tokens (input, output) for cost estimates; update from the Gemini pricing page.
+MODEL_PRICES = {
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+}
+
 # -------------------------
 # Utilities
 # -------------------------
@@ -111,9 +122,14 @@ def _ensure_model():
     Import and configure google.generativeai lazily.
     Never raise at import-time of this module.
     """
-    global _GENAI, _MODEL, _MODEL_ID
     if _MODEL is not None:
         return
+    with _INIT_LOCK:
+        if _MODEL is None:
+            _init_model()
+
+def _init_model():
+    global _GENAI, _MODEL, _MODEL_ID
 
     # Lazy import to prevent import-time failure if package missing.
     import google.generativeai as genai  # type: ignore
@@ -136,15 +152,26 @@ def _ensure_model():
             _MODEL_ID = mid
             break
 
-    _MODEL = genai.GenerativeModel(
-        _MODEL_ID,
+    _MODEL = build_model(_MODEL_ID)
+    _GENAI = genai
+
+def default_model_id() -> str:
+    """Id of the Gemini model evaluate_section1 uses when none is passed (initialises it)."""
+    _ensure_model()
+    return _MODEL_ID
+
+def build_model(model_id: str, temperature: float = 0.2, top_p: float = 0.95):
+    """Create a Gemini model configured for JSON evaluation (API key must be configured)."""
+    import google.generativeai as genai  # type: ignore
+
+    return genai.GenerativeModel(
+        model_id,
         generation_config={
             "response_mime_type": "application/json",  # ask for raw JSON
-            "temperature": 0.2,
-            "top_p": 0.95,
+            "temperature": temperature,
+            "top_p": top_p,
         },
     )
-    _GENAI = genai
 
 # -------------------------
 # DB call adapter
@@ -186,26 +213,28 @@ def _save_section1_adapted(
     if missing:
         raise TypeError(f"save_section1 is missing required keys after adaptation: {missing}")
 
-    return fn(**filtered)
+    return scheduler.run("db", fn, owner=candidate_id, **filtered)
 
 # -------------------------
 # Public API
 # -------------------------
-def evaluate_section1(
-    candidate_id: str,
+def build_prompt(
     transcript: str,
     question: str,
     expected_answer: str,
-    non_negotiables: str = ""
-) -> Dict[str, Any]:
-    """
-    Evaluate candidate's spoken answer using Gemini 2.x and persist to DB.
-    Returns the structured dict.
-    """
-    _ensure_model()
+    non_negotiables: str = "",
+    features: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Build the evaluator prompt for one answer, with locally computed features if given."""
+    feature_block = ""
+    if features:
+        lines = "\n".join(f"- {k}: {v}" for k, v in features.items() if v is not None)
+        feature_block = f"""
+
+Measured features of the response (computed locally, use as evidence for fluency/vocabulary):
+{lines}"""
 
-    prompt = f"""
-You are an English interview evaluator.
+    return f"""You are an English interview evaluator.
 
 Return ONLY a JSON object with keys:
 {{
@@ -235,12 +264,41 @@ Expected Answer (guideline):
 {expected_answer}
 
 Non-negotiables (if any):
-{non_negotiables}
+{non_negotiables}{feature_block}
 """.strip()
 
-    resp = _MODEL.generate_content(prompt)
-    result = _parse_json(getattr(resp, "text", "") or "")
-    result = _coerce_scores(result)
+
+def evaluate_section1(
+    candidate_id: str,
+    transcript: str,
+    question: str,
+    expected_answer: str,
+    non_negotiables: str = "",
+    persist: bool = True,
+    duration_s: Optional[float] = None,
+    model: Any = None,
+) -> Dict[str, Any]:
+    """
+    Evaluate candidate's spoken answer using Gemini 2.x and persist to DB.
+    Degenerate answers (failed transcription, empty, repetitive) are scored
+    locally without a model call. duration_s (recording length) enables the
+    words-per-minute feature. Pass persist=False to score without writing
+    (batch re-scoring, benchmarks). model overrides the default Gemini model
+    (anything with generate_content, e.g. from build_model()).
+    Returns the structured dict.
+    """
+    features, verdict = prescore(transcript, duration_s)
+    if verdict is not None:
+        result = verdict
+    else:
+        if model is None:
+            _ensure_model()
+            model = _MODEL
+        prompt = build_prompt(transcript, question, expected_answer, non_negotiables, features)
+        resp = scheduler.run("llm", model.generate_content, prompt, owner=candidate_id)
+        result = _parse_json(getattr(resp, "text", "") or "")
+        result = _coerce_scores(result)
+    result["features"] = features
 
     avg_score = int(
         (result["fluency"] +
@@ -251,12 +309,13 @@ Non-negotiables (if any):
     )
 
     # Save to DB with your required names
-    _save_section1_adapted(
-        candidate_id=candidate_id,
-        transcript=transcript,
-        result_json=result,
-        avg_score=avg_score,
-    )
+    if persist:
+        _save_section1_adapted(
+            candidate_id=candidate_id,
+            transcript=transcript,
+            result_json=result,
+            avg_score=avg_score,
+        )
 
     return {
         **result,
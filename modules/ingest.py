@@ -0,0 +1,162 @@
+# modules/ingest.py
+"""
+Streaming ingestion of candidate invite CSVs.
+
+The upload is parsed in chunks. Each chunk is normalized and validated
+with vectorized pandas string operations and de-duplicated against the
+emails already seen in the file plus the existing candidates (one set
+lookup). Accepted and rejected rows are spooled to CSV files in a
+per-upload directory on disk, so memory stays bounded no matter how large
+the upload is. Callers remove the directory with discard_batch() once the
+batch is replaced or processed; directories left behind by abandoned
+sessions are swept on the next ingest.
+"""
+from __future__ import annotations
+
+import glob
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterator, Optional, Set
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# numpy/pandas are imported inside the functions so importing this module
+# (Admin Invites page load) stays cheap.
+
+__all__ = ["REQUIRED_COLUMNS", "discard_batch", "ingest_invites", "iter_accepted", "read_preview"]
+
+REQUIRED_COLUMNS = ["candidate_id", "name", "email"]
+CHUNK_SIZE = 10_000
+PREVIEW_ROWS = 200
+SPOOL_PREFIX = "invites-"
+SPOOL_TTL = 24 * 60 * 60  # seconds before an abandoned spool directory is swept
+
+# Pragmatic address check: one @, no spaces, dotted domain with a 2+ letter TLD.
+_EMAIL_RE = r"[a-z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-z0-9](?:[a-z0-9-]*[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]*[a-z0-9])?)*\.[a-z]{2,}"
+
+
+def _new_ids(n: int) -> list:
+    return [f"C-{secrets.token_hex(4).upper()}" for _ in range(n)]
+
+
+def _append_csv(df: pd.DataFrame, path: str):
+    df.to_csv(path, mode="a", index=False, header=not os.path.exists(path) or os.path.getsize(path) == 0)
+
+
+def _sweep_stale(parent: Optional[str]):
+    cutoff = time.time() - SPOOL_TTL
+    for path in glob.glob(os.path.join(parent or tempfile.gettempdir(), SPOOL_PREFIX + "*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def discard_batch(batch: Optional[Dict[str, Any]]):
+    """Delete a batch's spool directory (safe to call twice or with None)."""
+    if batch and batch.get("spool_dir"):
+        shutil.rmtree(batch["spool_dir"], ignore_errors=True)
+
+
+def ingest_invites(
+    fileobj: BinaryIO,
+    existing_emails: Optional[Set[str]] = None,
+    chunksize: int = CHUNK_SIZE,
+    progress: Optional[Callable[[float, int], None]] = None,
+    spool_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Validate, normalize and de-duplicate an invite CSV chunk by chunk.
+
+    progress(fraction_done, rows_done) is called after each chunk when given.
+    Returns counts plus the spool directory and the paths of the accepted /
+    rejected spool files inside it; rejected rows carry a "reason" column.
+    Raises ValueError on missing columns (the spool is removed on any error).
+    """
+    import numpy as np
+    import pandas as pd
+
+    existing = existing_emails or set()
+    seen: Set[str] = set()
+    _sweep_stale(spool_dir)
+    spool = tempfile.mkdtemp(prefix=SPOOL_PREFIX, dir=spool_dir)
+    accepted_path = os.path.join(spool, "accepted.csv")
+    rejected_path = os.path.join(spool, "rejected.csv")
+    total_bytes = getattr(fileobj, "size", None)
+    n_rows = n_accepted = n_rejected = 0
+
+    try:
+        reader = pd.read_csv(fileobj, chunksize=chunksize, dtype=str, keep_default_na=False)
+        for chunk in reader:
+            missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"CSV missing required columns: {missing}")
+
+            df = chunk[REQUIRED_COLUMNS].copy()
+            df["candidate_id"] = df["candidate_id"].str.strip()
+            df["name"] = df["name"].str.strip().str.replace(r"\s+", " ", regex=True)
+            df["email"] = df["email"].str.strip().str.lower()
+
+            blank_email = df["email"].eq("")
+            invalid = ~blank_email & ~df["email"].str.fullmatch(_EMAIL_RE)
+            dup_in_file = df["email"].duplicated() | df["email"].isin(seen)
+            dup_existing = df["email"].isin(existing)
+            df["reason"] = np.select(
+                [blank_email, invalid, dup_in_file, dup_existing],
+                ["missing email", "invalid email", "duplicate in file", "already a candidate"],
+                default="",
+            )
+
+            ok = df["reason"].eq("")
+            accepted = df.loc[ok, REQUIRED_COLUMNS].copy()
+            blank_id = accepted["candidate_id"].eq("")
+            if blank_id.any():
+                accepted.loc[blank_id, "candidate_id"] = _new_ids(int(blank_id.sum()))
+            seen.update(df.loc[~blank_email & ~invalid, "email"])
+
+            _append_csv(accepted, accepted_path)
+            _append_csv(df.loc[~ok], rejected_path)
+
+            n_rows += len(df)
+            n_accepted += len(accepted)
+            n_rejected += int((~ok).sum())
+            if progress:
+                pos = fileobj.tell() if hasattr(fileobj, "tell") else 0
+                progress(min(1.0, pos / total_bytes) if total_bytes else 0.0, n_rows)
+    except BaseException:
+        shutil.rmtree(spool, ignore_errors=True)
+        raise
+
+    if progress:
+        progress(1.0, n_rows)
+    return {
+        "spool_dir": spool,
+        "rows": n_rows,
+        "accepted": n_accepted,
+        "rejected": n_rejected,
+        "accepted_path": accepted_path,
+        "rejected_path": rejected_path,
+    }
+
+
+def iter_accepted(path: str, chunksize: int = 1000) -> Iterator[pd.DataFrame]:
+    """Stream the accepted spool back in chunks for account creation."""
+    import pandas as pd
+
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    yield from pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+
+
+def read_preview(path: str, rows: int = PREVIEW_ROWS) -> pd.DataFrame:
+    """First rows of a spool file (empty frame if nothing was written)."""
+    import pandas as pd
+
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return pd.DataFrame()
+    return pd.read_csv(path, nrows=rows, dtype=str, keep_default_na=False)
@@ -0,0 +1,107 @@
+# modules/prescore.py
+"""
+Cheap local features for a transcript, computed before any model call.
+
+Degenerate answers (failed transcription, empty / near-empty or one word
+repeated) get a deterministic verdict without calling Gemini; for all other
+answers the features are passed into the evaluator prompt.
+"""
+from __future__ import annotations
+
+import io
+import re
+import wave
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from modules.transcriber import TRANSCRIPTION_ERROR_PREFIX
+
+__all__ = ["compute_features", "prescore", "wav_duration_seconds"]
+
+MIN_WORDS = 5
+REPETITIVE_MIN_WORDS = 20
+REPETITIVE_MAX_TTR = 0.15
+
+_WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+_SENTENCE_RE = re.compile(r"[.!?]+")
+_FILLERS = np.array(["um", "umm", "uh", "uhh", "er", "erm", "ah", "hmm"])
+_FILLER_BIGRAMS = np.array(["you know", "i mean", "kind of", "sort of"])
+
+_SCORE_KEYS = ("fluency", "grammar", "vocabulary", "coherence", "relevance")
+
+
+def wav_duration_seconds(data: bytes) -> Optional[float]:
+    """Length of a WAV recording in seconds, or None if it can't be read."""
+    try:
+        with wave.open(io.BytesIO(data), "rb") as w:
+            return w.getnframes() / float(w.getframerate())
+    except Exception:
+        return None
+
+
+def compute_features(transcript: str, duration_s: Optional[float] = None) -> Dict[str, Any]:
+    """Word count, words/minute, filler rate, type/token ratio and mean sentence length."""
+    text = (transcript or "").lower()
+    matches = list(_WORD_RE.finditer(text))
+    tokens = np.array([m.group() for m in matches], dtype=str)
+    n = int(tokens.size)
+    if n == 0:
+        return {
+            "word_count": 0,
+            "words_per_minute": 0.0 if duration_s else None,
+            "filler_rate": 0.0,
+            "type_token_ratio": 0.0,
+            "avg_sentence_length": 0.0,
+        }
+
+    fillers = int(np.isin(tokens, _FILLERS).sum())
+    if n > 1:
+        bigrams = np.char.add(np.char.add(tokens[:-1], " "), tokens[1:])
+        fillers += int(np.isin(bigrams, _FILLER_BIGRAMS).sum())
+
+    # Sentence index of each token = number of terminators before it
+    token_starts = np.fromiter((m.start() for m in matches), dtype=np.int64, count=n)
+    boundaries = np.fromiter((m.start() for m in _SENTENCE_RE.finditer(text)), dtype=np.int64)
+    sentence_lengths = np.bincount(np.searchsorted(boundaries, token_starts, side="right"))
+    sentence_lengths = sentence_lengths[sentence_lengths > 0]
+
+    return {
+        "word_count": n,
+        "words_per_minute": round(n / (duration_s / 60.0), 1) if duration_s else None,
+        "filler_rate": round(fillers / n, 3),
+        "type_token_ratio": round(np.unique(tokens).size / n, 3),
+        "avg_sentence_length": round(float(sentence_lengths.mean()), 1) if sentence_lengths.size else float(n),
+    }
+
+
+def _verdict(feedback: str, reason: str) -> Dict[str, Any]:
+    result = {k: 0 for k in _SCORE_KEYS}
+    result.update({"overall_pass": False, "feedback": feedback, "short_circuit": reason})
+    return result
+
+
+def prescore(transcript: str, duration_s: Optional[float] = None) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Return (features, verdict). verdict is a deterministic evaluation dict when the
+    answer is degenerate and the model call should be skipped, else None.
+    """
+    transcript = transcript or ""
+    if transcript.startswith(TRANSCRIPTION_ERROR_PREFIX):
+        return compute_features("", duration_s), _verdict(
+            "Your answer could not be transcribed. Please check your microphone and record again.",
+            "transcription_failed",
+        )
+
+    features = compute_features(transcript, duration_s)
+    if features["word_count"] < MIN_WORDS:
+        return features, _verdict(
+            "The response was empty or too short to evaluate. Please answer the question in full sentences.",
+            "too_short",
+        )
+    if features["word_count"] >= REPETITIVE_MIN_WORDS and features["type_token_ratio"] < REPETITIVE_MAX_TTR:
+        return features, _verdict(
+            "The response repeats the same few words and does not answer the question.",
+            "repetitive",
+        )
+    return features, None
@@ -0,0 +1,288 @@
+# modules/scheduler.py
+"""
+Process-wide admission control for shared backends.
+
+Every call to a backend ("transcriber", "llm", "db") goes through a
+limiter with:
+  - a token bucket (requests/second with a burst allowance),
+  - a concurrency cap,
+  - a FIFO queue, so callers are admitted strictly in arrival order.
+
+A burst of submissions therefore queues instead of exhausting quota or CPU
+for everyone at once. Callers tagged with an owner (the candidate_id) can
+ask for their queue position; metrics() reports depth/in-flight/wait for
+capacity planning.
+
+Page work runs on a shared background pool (run_in_background) whose jobs
+hold a worker while they wait in a limiter. Once the pool is full, new
+jobs wait for a free worker; those are counted in queue_position too, so
+a candidate still sees a position under the heaviest load.
+
+A backend with its own admission queue (the Whisper batch server) is
+registered with register_queue() instead; queue_position() and metrics()
+then report that queue for the backend.
+
+Limits come from env vars SCHED_<BACKEND>_RPS / _BURST / _CONCURRENCY,
+or configure() (e.g. the batch re-scoring CLI). SCHED_BACKGROUND_WORKERS
+sizes the background pool (default 32).
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+__all__ = [
+    "TokenBucket",
+    "BackendLimiter",
+    "configure",
+    "get_limiter",
+    "register_queue",
+    "run",
+    "run_in_background",
+    "queue_position",
+    "metrics",
+]
+
+# backend -> (requests/second, burst, max concurrent calls)
+_DEFAULTS = {
+    "transcriber": (5.0, 5, 4),
+    "llm": (2.0, 4, 4),
+    "db": (20.0, 20, 8),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available and return 0, else return seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait_s = self.try_acquire()
+            if not wait_s:
+                return
+            time.sleep(wait_s)
+
+
+class BackendLimiter:
+    """Rate limit + concurrency cap + FIFO queue for one backend."""
+
+    def __init__(self, name: str, rate: float, burst: float, concurrency: int):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = max(1, int(concurrency))
+        self._cond = threading.Condition()
+        self._queue = deque()  # (ticket, owner)
+        self._tickets = itertools.count()
+        self._in_flight = 0
+        self._admitted = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._depth_max = 0
+
+    def acquire(self, owner: Optional[str] = None):
+        entry = (next(self._tickets), owner)
+        enqueued = time.monotonic()
+        with self._cond:
+            self._queue.append(entry)
+            self._depth_max = max(self._depth_max, len(self._queue))
+            try:
+                while True:
+                    if self._queue[0] is entry and self._in_flight < self.concurrency:
+                        wait_s = self.bucket.try_acquire()
+                        if not wait_s:
+                            break
+                        self._cond.wait(wait_s)
+                    else:
+                        self._cond.wait()
+            except BaseException:
+                self._queue.remove(entry)
+                self._cond.notify_all()
+                raise
+            self._queue.popleft()
+            self._in_flight += 1
+            waited = time.monotonic() - enqueued
+            self._admitted += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._cond.notify_all()
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, owner: Optional[str] = None):
+        self.acquire(owner)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def position(self, owner: str) -> int:
+        """1-based position of owner's earliest queued call, 0 if none is waiting."""
+        with self._cond:
+            for i, (_, o) in enumerate(self._queue):
+                if o == owner:
+                    return i + 1
+        return 0
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "queue_depth_max": self._depth_max,
+                "in_flight": self._in_flight,
+                "concurrency": self.concurrency,
+                "rate_per_s": self.bucket.rate,
+                "admitted": self._admitted,
+                "avg_wait_s": round(self._wait_total / self._admitted, 3) if self._admitted else 0.0,
+                "max_wait_s": round(self._wait_max, 3),
+            }
+
+
+_LIMITERS: Dict[str, BackendLimiter] = {}
+_QUEUES: Dict[str, Any] = {}  # backend -> external queue with position(owner) / metrics()
+_LOCK = threading.Lock()
+_BACKGROUND_WORKERS = int(os.getenv("SCHED_BACKGROUND_WORKERS", 32))
+_BACKGROUND = ThreadPoolExecutor(max_workers=_BACKGROUND_WORKERS, thread_name_prefix="sched")
+_WAITING = deque()  # (ticket, owner) of background jobs not yet picked up by a worker
+_WAITING_LOCK = threading.Lock()
+_WAITING_TICKETS = itertools.count()
+
+
+def _from_env(name: str) -> BackendLimiter:
+    rate, burst, conc = _DEFAULTS.get(name, (10.0, 10, 4))
+    prefix = f"SCHED_{name.upper()}_"
+    return BackendLimiter(
+        name,
+        rate=float(os.getenv(prefix + "RPS", rate)),
+        burst=float(os.getenv(prefix + "BURST", burst)),
+        concurrency=int(os.getenv(prefix + "CONCURRENCY", conc)),
+    )
+
+
+def get_limiter(name: str) -> BackendLimiter:
+    with _LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            limiter = _LIMITERS[name] = _from_env(name)
+        return limiter
+
+
+def configure(name: str, rate: float, burst: Optional[float] = None, concurrency: Optional[int] = None):
+    """Replace a backend's limits (takes effect for calls that have not queued yet)."""
+    current = get_limiter(name)
+    with _LOCK:
+        _LIMITERS[name] = BackendLimiter(
+            name,
+            rate=rate,
+            burst=burst if burst is not None else max(1.0, rate),
+            concurrency=concurrency if concurrency is not None else current.concurrency,
+        )
+
+
+def register_queue(name: str, backend_queue: Any):
+    """
+    Report an external admission queue as backend `name`. It must provide
+    position(owner) and metrics() like BackendLimiter; callers submit to it
+    directly instead of going through run().
+    """
+    with _LOCK:
+        _QUEUES[name] = backend_queue
+
+
+def _queue_for(backend: str):
+    with _LOCK:
+        backend_queue = _QUEUES.get(backend)
+    return backend_queue if backend_queue is not None else get_limiter(backend)
+
+
+def run(backend: str, fn: Callable, *args, owner: Optional[str] = None, **kwargs):
+    """Call fn once admitted by the backend's limiter."""
+    with get_limiter(backend).slot(owner):
+        return fn(*args, **kwargs)
+
+
+def _stop_waiting(entry: tuple):
+    with _WAITING_LOCK:
+        try:
+            _WAITING.remove(entry)
+        except ValueError:
+            pass  # already started
+
+
+def run_in_background(fn: Callable, *args, owner: Optional[str] = None, **kwargs) -> Future:
+    """
+    Run fn on a shared worker thread so the caller can poll queue_position meanwhile.
+    owner tags the job while it waits for a free worker (it is not passed to fn).
+    """
+    entry = (next(_WAITING_TICKETS), owner)
+    with _WAITING_LOCK:
+        _WAITING.append(entry)
+
+    def job():
+        _stop_waiting(entry)
+        return fn(*args, **kwargs)
+
+    try:
+        fut = _BACKGROUND.submit(job)
+    except BaseException:
+        _stop_waiting(entry)
+        raise
+    fut.add_done_callback(lambda _: _stop_waiting(entry))  # cancelled before it started
+    return fut
+
+
+def queue_position(backend: str, owner: str) -> int:
+    """
+    1-based position of owner's earliest waiting call, 0 if none is waiting.
+    A job still waiting for a background worker ranks behind everything
+    already queued at the backend's limiter.
+    """
+    backend_queue = _queue_for(backend)
+    pos = backend_queue.position(owner)
+    if pos:
+        return pos
+    with _WAITING_LOCK:
+        ahead = next((i for i, (_, o) in enumerate(_WAITING) if o == owner), None)
+    if ahead is None:
+        return 0
+    return backend_queue.metrics()["queue_depth"] + ahead + 1
+
+
+def metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-backend queue/in-flight/wait metrics, plus the background pool."""
+    with _LOCK:
+        limiters = list(_LIMITERS.values())
+        queues = dict(_QUEUES)
+    report = {limiter.name: limiter.metrics() for limiter in limiters}
+    report.update({name: backend_queue.metrics() for name, backend_queue in queues.items()})
+    with _WAITING_LOCK:
+        waiting = len(_WAITING)
+    if waiting or report:
+        report["background"] = {"queue_depth": waiting, "concurrency": _BACKGROUND_WORKERS}
+    return report
@@ -0,0 +1,100 @@
+# modules/section1_voice.py
+"""
+Speculative transcription for Section 1.
+
+st.audio_input already holds the full recording before the candidate clicks
+"Submit Answer", so the page starts transcribing as soon as a new recording
+appears. Jobs are keyed by the SHA-256 of the audio bytes: Submit claims the
+finished (or still running) job for the same bytes, and a re-recording
+cancels or discards the stale one.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, MutableMapping, Optional, Tuple
+
+from modules.scheduler import run_in_background
+from modules.transcriber import transcribe_audio_local
+
+__all__ = [
+    "start_speculative_transcription",
+    "claim_transcription",
+    "discard_speculative_transcription",
+]
+
+_STATE_KEY = "s1_spec_hash"
+_JOB_TTL = 15 * 60  # seconds an unclaimed job is kept (candidate left the page)
+
+_JOBS: Dict[str, Tuple[Future, float]] = {}
+_LOCK = threading.Lock()
+
+
+def _transcribe_bytes(audio_bytes: bytes, owner: Optional[str]) -> str:
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio_bytes)
+        return transcribe_audio_local(path, owner=owner)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _prune(now: float):
+    for digest, (fut, created) in list(_JOBS.items()):
+        if now - created > _JOB_TTL:
+            fut.cancel()
+            del _JOBS[digest]
+
+
+def _drop(digest: Optional[str]):
+    if not digest:
+        return
+    with _LOCK:
+        entry = _JOBS.pop(digest, None)
+    if entry:
+        entry[0].cancel()  # no-op if already running; the result is simply discarded
+
+
+def start_speculative_transcription(state: MutableMapping[str, Any], audio_bytes: bytes, owner: Optional[str] = None) -> str:
+    """Start transcribing a freshly captured recording (no-op if it is already running)."""
+    digest = hashlib.sha256(audio_bytes).hexdigest()
+    previous = state.get(_STATE_KEY)
+    if previous == digest:
+        return digest
+    _drop(previous)
+
+    now = time.time()
+    with _LOCK:
+        _prune(now)
+        if digest not in _JOBS:
+            _JOBS[digest] = (run_in_background(_transcribe_bytes, audio_bytes, owner, owner=owner), now)
+    state[_STATE_KEY] = digest
+    return digest
+
+
+def claim_transcription(state: MutableMapping[str, Any], audio_bytes: bytes, owner: Optional[str] = None) -> Future:
+    """
+    Hand over the transcription job for these bytes, starting one if the
+    speculative job is missing (e.g. evicted or the page never saw the recording).
+    """
+    digest = hashlib.sha256(audio_bytes).hexdigest()
+    with _LOCK:
+        entry = _JOBS.pop(digest, None)
+    if entry is None or entry[0].cancelled():
+        entry = (run_in_background(_transcribe_bytes, audio_bytes, owner, owner=owner), time.time())
+    if state.get(_STATE_KEY) == digest:
+        state.pop(_STATE_KEY, None)
+    return entry[0]
+
+
+def discard_speculative_transcription(state: MutableMapping[str, Any]):
+    """Forget the current speculative job (question restarted)."""
+    _drop(state.pop(_STATE_KEY, None))
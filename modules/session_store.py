@@ -0,0 +1,223 @@
+# modules/session_store.py
+"""
+Persisted interview progress.
+
+Streamlit keeps st.session_state in one server process, so a refresh, pod
+restart or a load balancer sending the candidate to another replica loses
+progress. Login calls start_session(), which issues an opaque session id
+carried in the URL (?sid=...). Pages call restore_session() at the top and
+snapshot_session() after changing progress; any replica can then resolve
+the sid back to the candidate and their saved progress.
+
+The sid stands in for the password, so it is short-lived: each login
+issues a new one (the previous sid stops resolving) and a sid older than
+SESSION_TTL_S seconds (default 6 h) is refused, sending the candidate back
+to the login page.
+
+Stores (SESSION_STORE env var):
+  - "sqlite":   local file SESSION_DB_PATH (default data/sessions.db)
+  - "supabase": shared interview_sessions table, for multi-replica deploys
+"""
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, MutableMapping, Optional
+
+from dotenv import load_dotenv
+
+__all__ = [
+    "PERSISTED_KEYS",
+    "SqliteSessionStore",
+    "SupabaseSessionStore",
+    "get_session_store",
+    "start_session",
+    "restore_session",
+    "snapshot_session",
+]
+
+load_dotenv()
+
+# Progress that must survive a refresh or a hop to another replica.
+PERSISTED_KEYS = (
+    "consent",
+    "s1_current_q",
+    "s1_results",
+    "s1_timer_start",
+    "s2_test_link",
+    "status",
+    "final_payload",
+    "final_submitted",
+)
+
+_RESTORED_FLAG = "_session_restored"
+_SID_PARAM = "sid"
+SESSION_TTL_S = int(os.getenv("SESSION_TTL_S", 6 * 3600))
+
+
+class SqliteSessionStore:
+    """Single-node store backed by a local SQLite file."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS interview_sessions ("
+                " candidate_id TEXT PRIMARY KEY, sid TEXT UNIQUE, sid_issued_at REAL,"
+                " state TEXT NOT NULL DEFAULT '{}', updated_at REAL NOT NULL)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(interview_sessions)")}
+            if "sid_issued_at" not in columns:  # databases created before sids expired
+                self._conn.execute("ALTER TABLE interview_sessions ADD COLUMN sid_issued_at REAL")
+
+    def bind_sid(self, candidate_id: str, sid: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO interview_sessions (candidate_id, sid, sid_issued_at, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(candidate_id) DO UPDATE SET sid = excluded.sid,"
+                " sid_issued_at = excluded.sid_issued_at, updated_at = excluded.updated_at",
+                (candidate_id, sid, now, now),
+            )
+
+    def resolve_sid(self, sid: str, max_age: float = SESSION_TTL_S) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT candidate_id FROM interview_sessions WHERE sid = ? AND sid_issued_at >= ?",
+                (sid, time.time() - max_age),
+            ).fetchone()
+        return row[0] if row else None
+
+    def load(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM interview_sessions WHERE candidate_id = ?", (candidate_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, candidate_id: str, state: Dict[str, Any]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO interview_sessions (candidate_id, state, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(candidate_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                (candidate_id, json.dumps(state), time.time()),
+            )
+
+
+class SupabaseSessionStore:
+    """Shared store: one row per candidate in the interview_sessions table."""
+
+    def bind_sid(self, candidate_id: str, sid: str):
+        from db.supabase_client import supabase
+        now = int(time.time())
+        supabase.table("interview_sessions").upsert({
+            "candidate_id": candidate_id,
+            "sid": sid,
+            "sid_issued_at": now,
+            "updated_at": now,
+        }, on_conflict="candidate_id").execute()
+
+    def resolve_sid(self, sid: str, max_age: float = SESSION_TTL_S) -> Optional[str]:
+        from db.supabase_client import supabase
+        res = (
+            supabase.table("interview_sessions")
+            .select("candidate_id")
+            .eq("sid", sid)
+            .gte("sid_issued_at", int(time.time() - max_age))
+            .execute()
+        )
+        return res.data[0]["candidate_id"] if res.data else None
+
+    def load(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        from db.supabase_client import supabase
+        res = supabase.table("interview_sessions").select("state").eq("candidate_id", candidate_id).execute()
+        if not res.data:
+            return None
+        state = res.data[0]["state"]
+        return json.loads(state) if isinstance(state, str) else state
+
+    def save(self, candidate_id: str, state: Dict[str, Any]):
+        from db.supabase_client import supabase
+        supabase.table("interview_sessions").upsert({
+            "candidate_id": candidate_id,
+            "state": json.dumps(state),
+            "updated_at": int(time.time()),
+        }, on_conflict="candidate_id").execute()
+
+
+@lru_cache(maxsize=1)
+def get_session_store():
+    """Pick the store from SESSION_STORE (defaults to sqlite)."""
+    name = os.getenv("SESSION_STORE", "sqlite")
+    if name == "sqlite":
+        return SqliteSessionStore(os.getenv("SESSION_DB_PATH", "data/sessions.db"))
+    if name == "supabase":
+        return SupabaseSessionStore()
+    raise ValueError(f"Unknown SESSION_STORE: {name}")
+
+
+def start_session(state: MutableMapping[str, Any], params: MutableMapping[str, str], candidate_id: str):
+    """Bind a fresh session id to the candidate at login (replacing any earlier one) and put it in the URL."""
+    sid = secrets.token_urlsafe(24)
+    state["candidate_id"] = candidate_id
+    state[_SID_PARAM] = sid
+    params[_SID_PARAM] = sid
+    try:
+        get_session_store().bind_sid(candidate_id, sid)
+    except Exception:
+        pass  # falls back to in-process state only
+
+
+def restore_session(state: MutableMapping[str, Any], params: MutableMapping[str, str]) -> bool:
+    """
+    Recover the candidate (from ?sid= when this process has never seen them) and load
+    their saved progress into session state, once per browser session.
+    An unknown, replaced or expired sid is dropped from the URL and resolves to nobody.
+    Keys already present in session state win. Returns True if a snapshot was applied.
+    """
+    sid = state.get(_SID_PARAM) or params.get(_SID_PARAM)
+    if sid:
+        state[_SID_PARAM] = sid
+        if params.get(_SID_PARAM) != sid:
+            params[_SID_PARAM] = sid  # page switches drop query params; keep the URL resumable
+    candidate_id = state.get("candidate_id")
+    try:
+        if not candidate_id and sid:
+            candidate_id = get_session_store().resolve_sid(sid)
+            if candidate_id:
+                state["candidate_id"] = candidate_id
+            else:
+                state.pop(_SID_PARAM, None)
+                params.pop(_SID_PARAM, None)
+        if not candidate_id or state.get(_RESTORED_FLAG) == candidate_id:
+            return False
+        state[_RESTORED_FLAG] = candidate_id
+        saved = get_session_store().load(candidate_id)
+    except Exception:
+        return False  # never block the interview on the store
+    if not saved:
+        return False
+    for key in PERSISTED_KEYS:
+        if key in saved and key not in state:
+            state[key] = saved[key]
+    return True
+
+
+def snapshot_session(state: MutableMapping[str, Any]):
+    """Save the persisted keys of session state for the logged-in candidate."""
+    candidate_id = state.get("candidate_id")
+    if not candidate_id:
+        return
+    snapshot = {key: state[key] for key in PERSISTED_KEYS if key in state}
+    try:
+        get_session_store().save(candidate_id, snapshot)
+    except Exception:
+        pass  # progress stays in memory; the next snapshot retries
@@ -0,0 +1,290 @@
+# modules/storage.py
+"""
+Answer-audio storage.
+
+Recordings are transcoded to 16 kHz mono FLAC (via soundfile/libsndfile),
+addressed by the SHA-256 of the original recording alone, so re-submitting
+the same take never uploads twice and every replica derives the same key,
+and uploaded in resumable chunks on a background thread.
+
+Backends:
+  - "local":    files under AUDIO_STORAGE_DIR (tests / dev)
+  - "supabase": Supabase Storage bucket SUPABASE_BUCKET, via the TUS
+                resumable-upload endpoint (production)
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import os
+import threading
+import urllib.error
+import urllib.request
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+__all__ = [
+    "AUDIO_CONTENT_TYPE",
+    "LocalStorageBackend",
+    "SupabaseStorageBackend",
+    "get_storage_backend",
+    "to_mono_pcm16",
+    "store_answer_audio",
+    "audio_url",
+    "wait_for_uploads",
+]
+
+load_dotenv()
+
+TARGET_RATE = 16000
+AUDIO_CONTENT_TYPE = "audio/flac"
+CHUNK_SIZE = 6 * 1024 * 1024  # Supabase TUS requires exactly 6 MB chunks
+UPLOAD_RETRIES = 3
+SIGNED_URL_TTL = int(os.getenv("AUDIO_SIGNED_URL_TTL", 7 * 24 * 3600))
+
+# -------------------------
+# Transcoding
+# -------------------------
+def to_mono_pcm16(data: bytes) -> bytes:
+    """Decode a WAV recording to raw 16-bit mono PCM at TARGET_RATE."""
+    import numpy as np
+
+    with wave.open(io.BytesIO(data), "rb") as w:
+        channels = w.getnchannels()
+        width = w.getsampwidth()
+        rate = w.getframerate()
+        frames = w.readframes(w.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+
+    if rate != TARGET_RATE and samples.size:
+        n_out = int(round(samples.size * TARGET_RATE / rate))
+        x_old = np.arange(samples.size, dtype=np.float64) / rate
+        x_new = np.arange(n_out, dtype=np.float64) / TARGET_RATE
+        samples = np.interp(x_new, x_old, samples).astype(np.float32)
+
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+
+def _transcode(data: bytes) -> bytes:
+    """Encode a recording as 16 kHz mono 16-bit FLAC."""
+    import numpy as np
+    import soundfile as sf  # imported on first upload to keep page cold start fast
+
+    samples = np.frombuffer(to_mono_pcm16(data), dtype="<i2")
+    buf = io.BytesIO()
+    sf.write(buf, samples, TARGET_RATE, format="FLAC", subtype="PCM_16")
+    return buf.getvalue()
+
+# -------------------------
+# Backends
+# -------------------------
+class LocalStorageBackend:
+    """Stores objects as files under a root directory."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def upload(self, key: str, data: bytes, content_type: str):
+        """Write in chunks to <key>.part, resuming from whatever a previous attempt left."""
+        path = self._path(key)
+        part = path + ".part"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        if offset > len(data):
+            offset = 0
+            os.remove(part)
+        with open(part, "ab") as f:
+            while offset < len(data):
+                f.write(data[offset : offset + CHUNK_SIZE])
+                f.flush()
+                offset = f.tell()
+        os.replace(part, path)
+
+    def url(self, key: str) -> str:
+        # st.audio accepts a local file path
+        return self._path(key)
+
+
+class SupabaseStorageBackend:
+    """Stores objects in a Supabase Storage bucket using TUS resumable uploads."""
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+        self.base_url = os.getenv("SUPABASE_URL", "").rstrip("/")
+        self.api_key = os.getenv("SUPABASE_KEY", "")
+        self._resume_urls: Dict[str, str] = {}
+
+    def _bucket(self):
+        from db.supabase_client import supabase
+        return supabase.storage.from_(self.bucket)
+
+    def exists(self, key: str) -> bool:
+        folder, _, name = key.rpartition("/")
+        try:
+            items = self._bucket().list(folder, {"search": name})
+        except Exception:
+            return False
+        return any(item.get("name") == name for item in items or [])
+
+    def _request(self, method: str, url: str, headers: dict, body: Optional[bytes] = None):
+        headers = {
+            "authorization": f"Bearer {self.api_key}",
+            "apikey": self.api_key,
+            "tus-resumable": "1.0.0",
+            **headers,
+        }
+        req = urllib.request.Request(url, data=body, headers=headers, method=method)
+        return urllib.request.urlopen(req, timeout=60)
+
+    def _create_upload(self, key: str, length: int, content_type: str) -> str:
+        def b64(v: str) -> str:
+            return base64.b64encode(v.encode()).decode()
+
+        metadata = ",".join([
+            f"bucketName {b64(self.bucket)}",
+            f"objectName {b64(key)}",
+            f"contentType {b64(content_type)}",
+            f"cacheControl {b64('3600')}",
+        ])
+        with self._request(
+            "POST",
+            f"{self.base_url}/storage/v1/upload/resumable",
+            {"upload-length": str(length), "upload-metadata": metadata, "x-upsert": "true"},
+        ) as resp:
+            return resp.headers["Location"]
+
+    def _current_offset(self, upload_url: str) -> int:
+        with self._request("HEAD", upload_url, {}) as resp:
+            return int(resp.headers.get("Upload-Offset", 0))
+
+    def upload(self, key: str, data: bytes, content_type: str):
+        """Upload in CHUNK_SIZE pieces; a retry resumes from the server's offset."""
+        last_error = None
+        for _ in range(UPLOAD_RETRIES):
+            try:
+                upload_url = self._resume_urls.get(key)
+                if upload_url:
+                    offset = self._current_offset(upload_url)
+                else:
+                    upload_url = self._create_upload(key, len(data), content_type)
+                    self._resume_urls[key] = upload_url
+                    offset = 0
+                while offset < len(data):
+                    chunk = data[offset : offset + CHUNK_SIZE]
+                    with self._request(
+                        "PATCH",
+                        upload_url,
+                        {"upload-offset": str(offset), "content-type": "application/offset+octet-stream"},
+                        chunk,
+                    ) as resp:
+                        offset = int(resp.headers.get("Upload-Offset", offset + len(chunk)))
+                self._resume_urls.pop(key, None)
+                return
+            except urllib.error.HTTPError as e:
+                last_error = e
+                if e.code in (404, 410):  # upload expired server-side; start over
+                    self._resume_urls.pop(key, None)
+            except (urllib.error.URLError, OSError) as e:
+                last_error = e
+        raise RuntimeError(f"Audio upload failed for {key}: {last_error}")
+
+    def url(self, key: str) -> str:
+        res = self._bucket().create_signed_url(key, SIGNED_URL_TTL)
+        return res.get("signedURL") or res.get("signedUrl")
+
+
+@lru_cache(maxsize=1)
+def get_storage_backend():
+    """Pick the backend from AUDIO_STORAGE_BACKEND (defaults to supabase when a bucket is set)."""
+    bucket = os.getenv("SUPABASE_BUCKET")
+    name = os.getenv("AUDIO_STORAGE_BACKEND") or ("supabase" if bucket else "local")
+    if name == "supabase":
+        if not bucket:
+            raise RuntimeError("SUPABASE_BUCKET is not set in environment (.env).")
+        return SupabaseStorageBackend(bucket)
+    if name == "local":
+        return LocalStorageBackend(os.getenv("AUDIO_STORAGE_DIR", "data/audio"))
+    raise ValueError(f"Unknown AUDIO_STORAGE_BACKEND: {name}")
+
+# -------------------------
+# Background uploads
+# -------------------------
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="audio-upload")
+_PENDING: Dict[str, Future] = {}
+_LOCK = threading.Lock()
+
+
+def _upload_job(key: str, data: bytes):
+    backend = get_storage_backend()
+    if backend.exists(key):
+        return
+    backend.upload(key, _transcode(data), AUDIO_CONTENT_TYPE)
+
+
+def _forget_if_done(key: str, fut: Future):
+    # Successful uploads need no tracking; failures stay so audio_url can report them.
+    if fut.exception() is None:
+        with _LOCK:
+            if _PENDING.get(key) is fut:
+                del _PENDING[key]
+
+
+def store_answer_audio(data: bytes) -> str:
+    """
+    Queue a recording for transcoding + upload and return its content key.
+    Identical recordings map to the same key and are uploaded once.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    key = f"audio/{digest[:2]}/{digest}"
+    with _LOCK:
+        fut = _PENDING.get(key)
+        if fut is None or (fut.done() and fut.exception() is not None):
+            fut = _EXECUTOR.submit(_upload_job, key, data)
+            _PENDING[key] = fut
+            fut.add_done_callback(lambda f, k=key: _forget_if_done(k, f))
+    return key
+
+
+def audio_url(key: str, timeout: Optional[float] = 30) -> Optional[str]:
+    """Playback URL for a stored key; waits for its upload if still running. None on failure."""
+    with _LOCK:
+        fut = _PENDING.get(key)
+    try:
+        if fut is not None:
+            fut.result(timeout=timeout)
+        return get_storage_backend().url(key)
+    except Exception:
+        return None
+
+
+def wait_for_uploads(timeout: Optional[float] = None):
+    """Block until all queued uploads have finished (used by batch jobs and shutdown)."""
+    with _LOCK:
+        futures = list(_PENDING.values())
+    for fut in futures:
+        try:
+            fut.result(timeout=timeout)
+        except Exception:
+            pass
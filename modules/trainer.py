@@ -0,0 +1,201 @@
+# modules/trainer.py
+"""
+Batch re-scoring of stored Section 1 answers.
+
+Streams final submissions from the DB, re-evaluates every answer with the
+current rubric/model (persistence disabled), and bulk-writes the results to
+the s1_rescores table. Completed answers are appended to a checkpoint file
+after each write, so a crashed run resumes where it stopped.
+
+Usage:
+    python -m modules.trainer --run-id rubric-v2 --workers 8 --rps 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterator, Set, Tuple
+
+from db.queries import iter_final_submissions, save_rescores
+from modules import scheduler
+from modules.evaluator import MODEL_PRICES, build_prompt, default_model_id, evaluate_section1
+from modules.prescore import prescore
+
+QUESTIONS_PATH = "data/section1_questions.json"
+CHARS_PER_TOKEN = 4          # rough estimate for English text
+OUTPUT_TOKENS_PER_CALL = 120  # the JSON verdict is short
+
+# -------------------------
+# Checkpointing
+# -------------------------
+def _load_checkpoint(path: str) -> Set[Tuple[str, str]]:
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn final line from a crash
+            done.add((rec["candidate_id"], str(rec["question_id"])))
+    return done
+
+
+def _append_checkpoint(path: str, rows: list):
+    with open(path, "a", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps({"candidate_id": r["candidate_id"], "question_id": r["question_id"]}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+# -------------------------
+# Job
+# -------------------------
+def _iter_answers(questions: Dict[str, Dict[str, Any]], done: Set[Tuple[str, str]]) -> Iterator[Dict[str, Any]]:
+    for submission in iter_final_submissions():
+        cid = submission["candidate_id"]
+        for answer in submission.get("section1", {}).get("answers", []):
+            qid = str(answer.get("question_id"))
+            if (cid, qid) in done or qid not in questions:
+                continue
+            yield {"candidate_id": cid, "question_id": qid, "transcript": answer.get("transcript", "")}
+
+
+def _rescore(item: Dict[str, Any], q: Dict[str, Any], run_id: str) -> Dict[str, Any]:
+    result = evaluate_section1(
+        item["candidate_id"],
+        item["transcript"],
+        q["question"],
+        " | ".join(q["expected_answer"]),
+        q.get("non_negotiables", ""),
+        persist=False,
+    )
+    return {
+        "run_id": run_id,
+        "candidate_id": item["candidate_id"],
+        "question_id": item["question_id"],
+        "evaluation": json.dumps(result),
+        "final_score": result["final_score"],
+        "status": result["status"],
+    }
+
+
+def _estimate_tokens(item: Dict[str, Any], q: Dict[str, Any]) -> Tuple[int, int]:
+    features, verdict = prescore(item["transcript"])
+    if verdict is not None:
+        return 0, 0  # answered locally, no model call
+    prompt = build_prompt(item["transcript"], q["question"], " | ".join(q["expected_answer"]), q.get("non_negotiables", ""), features)
+    return len(prompt) // CHARS_PER_TOKEN, OUTPUT_TOKENS_PER_CALL
+
+
+def run(args: argparse.Namespace):
+    with open(QUESTIONS_PATH, "r", encoding="utf-8") as f:
+        questions = {str(q["id"]): q for q in json.load(f)}
+
+    done = _load_checkpoint(args.checkpoint)
+    print(f"[rescore] run_id={args.run_id} resuming with {len(done)} answers already done")
+
+    # Cost estimate: explicit --price-in/--price-out win, else the evaluator model's list price.
+    model_id = default_model_id()
+    price_in, price_out = MODEL_PRICES.get(model_id, (None, None))
+    price_in = args.price_in if args.price_in is not None else price_in
+    price_out = args.price_out if args.price_out is not None else price_out
+    if price_in is None or price_out is None:
+        print(f"[rescore] no price for model {model_id}; pass --price-in/--price-out for a cost estimate")
+
+    # evaluate_section1 goes through the shared "llm" limiter; size it for this run.
+    scheduler.configure("llm", rate=args.rps, concurrency=args.workers)
+    pending_rows, in_flight = [], {}
+    n_done = n_failed = tok_in = tok_out = 0
+    started = last_report = time.monotonic()
+
+    def report(final: bool = False):
+        elapsed = max(1e-6, time.monotonic() - started)
+        if price_in is None or price_out is None:
+            cost = "cost n/a"
+        else:
+            cost = f"~${tok_in / 1e6 * price_in + tok_out / 1e6 * price_out:.4f} est. ({model_id})"
+        print(
+            f"[rescore] {'final' if final else 'progress'}: {n_done} scored, {n_failed} failed, "
+            f"{n_done / elapsed:.2f} answers/s, ~{tok_in + tok_out} tokens, {cost}"
+        )
+
+    def flush():
+        nonlocal pending_rows
+        if pending_rows:
+            save_rescores(pending_rows)
+            _append_checkpoint(args.checkpoint, pending_rows)
+            pending_rows = []
+
+    answers = _iter_answers(questions, done)
+    if args.limit:
+        answers = islice(answers, args.limit)
+
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="rescore") as pool:
+        exhausted = False
+        while not exhausted or in_flight:
+            # Keep a bounded window of work in flight so the stream is never fully materialised.
+            while not exhausted and len(in_flight) < args.workers * 2:
+                item = next(answers, None)
+                if item is None:
+                    exhausted = True
+                    break
+                q = questions[item["question_id"]]
+                in_flight[pool.submit(_rescore, item, q, args.run_id)] = (item, q)
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                item, q = in_flight.pop(fut)
+                try:
+                    pending_rows.append(fut.result())
+                    n_done += 1
+                    t_in, t_out = _estimate_tokens(item, q)
+                    tok_in += t_in
+                    tok_out += t_out
+                except Exception as e:
+                    n_failed += 1
+                    print(f"[rescore] {item['candidate_id']} Q{item['question_id']} failed: {e}")
+
+            if len(pending_rows) >= args.batch_size:
+                flush()
+            if time.monotonic() - last_report >= args.report_every:
+                report()
+                last_report = time.monotonic()
+
+    flush()
+    report(final=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score stored Section 1 answers in bulk.")
+    parser.add_argument("--run-id", required=True, help="Label stored with every result (e.g. rubric-v2).")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent evaluator calls.")
+    parser.add_argument("--rps", type=float, default=2.0, help="Global evaluator requests per second.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Results per bulk DB write.")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: data/rescore_<run-id>.jsonl).")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after this many answers (0 = all).")
+    parser.add_argument("--report-every", type=float, default=10.0, help="Seconds between progress lines.")
+    parser.add_argument("--price-in", type=float, default=None,
+                        help="USD per 1M input tokens (default: list price of the evaluator's model).")
+    parser.add_argument("--price-out", type=float, default=None,
+                        help="USD per 1M output tokens (default: list price of the evaluator's model).")
+    args = parser.parse_args(argv)
+    if args.rps <= 0:
+        parser.error("--rps must be greater than 0")
+    if not args.checkpoint:
+        args.checkpoint = f"data/rescore_{args.run_id}.jsonl"
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,74 @@
-import speech_recognition as sr
+import os
 
-def transcribe_audio_local(file_path: str) -> str:
+from dotenv import load_dotenv
+
+from modules import scheduler
+from modules.transcript_cache import audio_fingerprint, get_transcript_cache
+
+load_dotenv()
+
+# Failed transcriptions are returned as text starting with this prefix.
+TRANSCRIPTION_ERROR_PREFIX = "Error during transcription"
+
+# "google": SpeechRecognition's Google Web API (default)
+# "whisper": local Whisper behind the micro-batching server (modules/batch_transcriber.py)
+TRANSCRIBE_BACKEND = os.getenv("TRANSCRIBE_BACKEND", "google")
+
+# Identify the recognizer in cache keys; change when switching engine/model.
+if TRANSCRIBE_BACKEND == "whisper":
+    BACKEND_ID = "whisper/batched"
+    MODEL_ID = os.getenv("WHISPER_MODEL", "base.en")
+
+    from modules.batch_transcriber import get_batch_server  # light: the model loads on first use
+
+    # The batch server's bounded queue is the "transcriber" admission control
+    scheduler.register_queue("transcriber", get_batch_server())
+else:
+    BACKEND_ID = "speech_recognition/google"
+    MODEL_ID = "en-US"
+
+
+def _recognize_whisper(file_path: str, owner: str = None) -> str:
+    import numpy as np
+    from modules.storage import to_mono_pcm16
+
+    with open(file_path, "rb") as f:
+        pcm = to_mono_pcm16(f.read())
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    return get_batch_server().transcribe(samples, owner=owner)
+
+
+def _recognize(file_path: str, owner: str = None) -> str:
+    if TRANSCRIBE_BACKEND == "whisper":
+        # Admitted by the batch server's own queue (registered as "transcriber")
+        return _recognize_whisper(file_path, owner=owner)
+
+    import speech_recognition as sr  # imported on first use to keep page cold start fast
+
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(file_path) as source:
+        audio = recognizer.record(source)
+    return scheduler.run("transcriber", recognizer.recognize_google, audio, language=MODEL_ID, owner=owner)
+
+
+def transcribe_audio_local(file_path: str, owner: str = None) -> str:
     """
-    Transcribe audio locally using SpeechRecognition (Google Web API).
+    Transcribe audio locally using SpeechRecognition (Google Web API), or
+    local Whisper with cross-session batching when TRANSCRIBE_BACKEND=whisper.
     Free but works best for short clips (<1 min).
+    Google calls are admitted through the shared "transcriber" limiter, Whisper
+    requests through the batch server's bounded queue; either way owner is the
+    candidate_id used for queue-position reporting. Successful results
+    are cached by audio fingerprint; errors are never cached.
     """
-    recognizer = sr.Recognizer()
     try:
-        with sr.AudioFile(file_path) as source:
-            audio = recognizer.record(source)
-        text = recognizer.recognize_google(audio)
+        with open(file_path, "rb") as f:
+            key = audio_fingerprint(f.read(), BACKEND_ID, MODEL_ID)
+        cache = get_transcript_cache()
+        text = cache.get(key)
+        if text is None:
+            text = _recognize(file_path, owner=owner)
+            cache.put(key, text)
         return text
     except Exception as e:
-        return f"Error during transcription: {e}"
+        return f"{TRANSCRIPTION_ERROR_PREFIX}: {e}"
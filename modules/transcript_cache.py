@@ -0,0 +1,138 @@
+# modules/transcript_cache.py
+"""
+Transcription result cache.
+
+Keyed by SHA-256 over (backend id, model id, normalized PCM), so the same
+recording hits the cache regardless of container/sample-rate differences,
+and switching recognizer or model never serves a stale transcript.
+
+Two tiers:
+  - in-memory LRU (TRANSCRIPT_CACHE_MEM_ITEMS entries)
+  - on-disk JSON files under TRANSCRIPT_CACHE_DIR, evicted least-recently-used
+    beyond TRANSCRIPT_CACHE_DISK_ITEMS entries (swept every 50 writes)
+
+Only successful transcripts are stored; callers never put error results.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+
+__all__ = ["TranscriptCache", "audio_fingerprint", "get_transcript_cache"]
+
+load_dotenv()
+
+_EVICT_EVERY = 50  # disk puts between eviction sweeps
+
+
+def audio_fingerprint(audio_bytes: bytes, backend: str, model_id: str) -> str:
+    """Cache key for a recording: hash of backend + model + 16 kHz mono PCM."""
+    from modules.storage import to_mono_pcm16
+
+    try:
+        pcm = to_mono_pcm16(audio_bytes)
+    except Exception:
+        pcm = audio_bytes  # not a WAV we can decode; fall back to the raw bytes
+    h = hashlib.sha256()
+    h.update(f"{backend}\0{model_id}\0".encode("utf-8"))
+    h.update(pcm)
+    return h.hexdigest()
+
+
+class TranscriptCache:
+    """Bounded in-memory LRU in front of an on-disk store with LRU eviction."""
+
+    def __init__(self, directory: Optional[str], mem_items: int = 256, disk_items: int = 5000):
+        self.directory = directory
+        self.mem_items = mem_items
+        self.disk_items = disk_items
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remember(self, key: str, text: str):
+        with self._lock:
+            self._mem[key] = text
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.mem_items:
+                self._mem.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._mem.get(key)
+            if text is not None:
+                self._mem.move_to_end(key)
+                return text
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = json.load(f)["text"]
+            os.utime(path)  # mtime doubles as last-used time for eviction
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str):
+        self._remember(key, text)
+        if not self.directory:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"text": text}, f)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._puts += 1
+            sweep = self._puts % _EVICT_EVERY == 0
+        if sweep:
+            self.evict()
+
+    def evict(self):
+        """Delete least-recently-used disk entries beyond disk_items."""
+        if not self.directory:
+            return
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        except OSError:
+            return
+        excess = len(entries) - self.disk_items
+        if excess <= 0:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:excess]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=1)
+def get_transcript_cache() -> TranscriptCache:
+    directory = os.getenv("TRANSCRIPT_CACHE_DIR", "data/transcript_cache")
+    return TranscriptCache(
+        directory or None,
+        mem_items=int(os.getenv("TRANSCRIPT_CACHE_MEM_ITEMS", 256)),
+        disk_items=int(os.getenv("TRANSCRIPT_CACHE_DISK_ITEMS", 5000)),
+    )
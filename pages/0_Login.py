@@ -1,6 +1,7 @@
 import streamlit as st
 import hashlib
 from db.supabase_client import supabase
+from modules.session_store import start_session
 
 st.set_page_config(page_title="Login", page_icon="🔑", layout="centered")
 st.title("🔑 Login")
@@ -31,7 +32,7 @@ else:  # Candidate login
             password_hash = hashlib.sha256(password.encode()).hexdigest()
             res = supabase.table("candidates").select("*").eq("email", email).eq("password_hash", password_hash).execute()
             if res.data:
-                st.session_state["candidate_id"] = res.data[0]["candidate_id"]
+                start_session(st.session_state, st.query_params, res.data[0]["candidate_id"])
                 st.success("✅ Candidate login successful! Redirecting...")
                 st.switch_page("pages/2_Section1.py")
             else:
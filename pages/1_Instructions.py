@@ -1,7 +1,10 @@
 import streamlit as st
 from utils.helpers import go_fullscreen
+from modules.session_store import restore_session, snapshot_session
 st.title("Instructions & Consent")
 
+restore_session(st.session_state, st.query_params)
+
 st.markdown("""
 ### 📌 Instructions
 1. Ensure your microphone and camera are working.  
@@ -14,5 +17,6 @@ By continuing, you consent to the use of your data for evaluation.
 
 if st.button("✅ I Agree & Start Interview"):
     st.session_state["consent"] = True
+    snapshot_session(st.session_state)
     go_fullscreen()
     st.success("Fullscreen enabled! Now go to Section 1.")
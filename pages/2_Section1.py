@@ -1,20 +1,35 @@
 import streamlit as st
-import tempfile
 import json
 import time
-from modules.transcriber import transcribe_audio_local
+from modules.section1_voice import (
+    start_speculative_transcription,
+    claim_transcription,
+    discard_speculative_transcription,
+)
 from modules.evaluator import evaluate_section1
+from modules.prescore import wav_duration_seconds
+from modules.storage import AUDIO_CONTENT_TYPE, store_answer_audio, audio_url
+from modules.session_store import restore_session, snapshot_session
+from modules.scheduler import run_in_background, queue_position
+from modules.transcriber import TRANSCRIPTION_ERROR_PREFIX
 
 st.title("Section 1: Voice Interview")
 
+# ✅ Resume saved progress (refresh / restart / another replica)
+restore_session(st.session_state, st.query_params)
+
 # ✅ Consent check
 if "consent" not in st.session_state or not st.session_state["consent"]:
     st.error("⚠️ Please complete the Instructions page first.")
     st.stop()
 
-# ✅ Load questions
-with open("data/section1_questions.json", "r", encoding="utf-8") as f:
-    questions = json.load(f)
+# ✅ Load questions (parsed once per process, not on every rerun)
+@st.cache_data
+def load_questions():
+    with open("data/section1_questions.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+questions = load_questions()
 
 # ✅ Track progress
 if "s1_current_q" not in st.session_state:
@@ -37,6 +52,7 @@ MAX_TIME = 120  # seconds
 def _start_timer_if_needed():
     if st.session_state["s1_timer_start"] is None:
         st.session_state["s1_timer_start"] = time.time()
+        snapshot_session(st.session_state)
 
 def _remaining_seconds() -> int:
     elapsed = int(time.time() - st.session_state["s1_timer_start"])
@@ -75,8 +91,14 @@ if current_q_index < total_qs:
     _start_timer_if_needed()
     remaining = _remaining_seconds()
 
-    # Candidate records answer
-    audio_file = st.audio_input("🎤 Record your response:")
+    candidate_id = st.session_state.get("candidate_id", "test123")
+
+    # Candidate records answer (keyed per question so the last answer's clip doesn't carry over)
+    audio_file = st.audio_input("🎤 Record your response:", key=f"s1_audio_{current_q_index}")
+
+    # Start transcribing as soon as a (new) recording exists, so Submit rarely waits on it
+    if audio_file:
+        start_speculative_transcription(st.session_state, audio_file.getvalue(), owner=candidate_id)
 
     # Buttons row
     col1, col2 = st.columns(2)
@@ -86,6 +108,8 @@ if current_q_index < total_qs:
     if reset_clicked:
         # Reset timer & any temp state for this question
         st.session_state["s1_timer_start"] = None
+        discard_speculative_transcription(st.session_state)
+        snapshot_session(st.session_state)
         st.rerun()
 
     # If user hasn't submitted yet, render the silent countdown
@@ -102,39 +126,61 @@ if current_q_index < total_qs:
             st.error("Please record your response before submitting.")
             st.stop()
 
-        # Save locally
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        temp_file.write(audio_file.getbuffer())
-        temp_file.close()
-
-        audio_url = None  # skipping upload for prototype
+        audio_bytes = audio_file.getvalue()
+
+        # Upload for review in the background (deduplicated by content hash)
+        audio_key = store_answer_audio(audio_bytes)
+
+        # Reuse the speculative transcription of this exact recording
+        transcription = claim_transcription(st.session_state, audio_bytes, owner=candidate_id)
+
+        def _process_answer():
+            # Step 1: Transcription (usually already finished)
+            transcript = transcription.result()
+            if transcript.startswith(TRANSCRIPTION_ERROR_PREFIX):
+                return transcript, None  # nothing to score; the candidate retries this question
+
+            # Step 2: Gemini evaluation
+            eval_result = evaluate_section1(
+                candidate_id,
+                transcript,
+                q["question"],
+                " | ".join(q["expected_answer"]),
+                q.get("non_negotiables", ""),
+                duration_s=wav_duration_seconds(audio_bytes),
+            )
+            return transcript, eval_result
+
+        # Both steps are admission-controlled; show queue position while waiting
+        job = run_in_background(_process_answer, owner=candidate_id)
+        status = st.empty()
+        while not job.done():
+            pos = queue_position("transcriber", candidate_id) or queue_position("llm", candidate_id)
+            status.info(f"⏳ High demand right now – you are #{pos} in the queue." if pos else "⏳ Processing your answer...")
+            time.sleep(0.5)
+        status.empty()
+        transcript, eval_result = job.result()
+
+        if eval_result is None:
+            st.error("❌ Your answer could not be transcribed. Please check your microphone and record again.")
+            st.stop()
 
-        # Step 1: Transcription
-        transcript = transcribe_audio_local(temp_file.name)
         st.markdown("**📝 Transcript:**")
         st.write(transcript)
 
-        # Step 2: Gemini evaluation
-        eval_result = evaluate_section1(
-            st.session_state.get("candidate_id", "test123"),
-            transcript,
-            q["question"],
-            " | ".join(q["expected_answer"]),
-            q.get("non_negotiables", "")
-        )
-
         # Save result
         st.session_state["s1_results"].append({
             "question_id": q["id"],
             "question": q["question"],
             "transcript": transcript,
             "evaluation": eval_result,
-            "audio_url": audio_url
+            "audio_key": audio_key
         })
 
         # Reset timer & go next
         st.session_state["s1_timer_start"] = None
         st.session_state["s1_current_q"] += 1
+        snapshot_session(st.session_state)
         st.rerun()
 
 # ✅ End of section
@@ -144,7 +190,8 @@ else:
 
     for r in st.session_state["s1_results"]:
         st.markdown(f"**Q{r['question_id']}: {r['question']}**")
-        if r["audio_url"]:
-            st.audio(r["audio_url"])
+        url = audio_url(r["audio_key"]) if r.get("audio_key") else None
+        if url:
+            st.audio(url, format=AUDIO_CONTENT_TYPE)
         st.markdown(f"Transcript: {r['transcript']}")
         st.json(r["evaluation"])
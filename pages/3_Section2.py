@@ -1,9 +1,12 @@
 import streamlit as st
 import random
 from db.queries import save_section2
+from modules.session_store import restore_session, snapshot_session
 
 st.title("Section 2: Written Assessment")
 
+restore_session(st.session_state, st.query_params)
+
 # ✅ Allow entry regardless of Section 1 status (just warn)
 if not st.session_state.get("s1_results"):
     st.warning("⚠️ Section 1 isn’t completed yet. You can still proceed with Section 2.")
@@ -25,6 +28,7 @@ if "s2_test_link" not in st.session_state:
     # rng = random.Random(hash(str(candidate_id)) & 0xFFFFFFFF)
     # st.session_state["s2_test_link"] = rng.choice(tests)
     st.session_state["s2_test_link"] = random.choice(tests)
+    snapshot_session(st.session_state)
 
 # 📌 Display instructions
 st.subheader("📝 Assessment Instructions")
@@ -56,6 +60,7 @@ if submitted:
     # Save a simple status; adjust signature if your DB expects different args
     save_section2(candidate_id, st.session_state["s2_test_link"], "Submitted via Google Form")
     st.session_state["status"] = "submitted"
+    snapshot_session(st.session_state)
 
     st.success("🎉 Thank you! Your Section 2 submission is recorded.")
     st.balloons()
@@ -1,8 +1,12 @@
 import streamlit as st
 import time
+from db.queries import save_final_submission
+from modules.session_store import restore_session, snapshot_session
 
 st.title("Submit Interview")
 
+restore_session(st.session_state, st.query_params)
+
 # --- Read session info ---
 candidate_id = st.session_state.get("candidate_id", "test123")
 s1_results = st.session_state.get("s1_results", [])
@@ -61,13 +65,16 @@ if st.button("Finalize & Submit", type="primary", disabled=not confirm):
         "submitted_at": int(time.time()),
     }
 
-    # Keep it in session for now; you can read this in a backend/save step
+    # Persist first so a worker restart can't lose the submission
+    try:
+        save_final_submission(candidate_id, final_payload)
+    except Exception as e:
+        st.error(f"❌ Could not save your submission, please try again: {e}")
+        st.stop()
+
     st.session_state["final_payload"] = final_payload
     st.session_state["final_submitted"] = True
-
-    # If you already have a DB function, you can safely call it here:
-    # from db.queries import save_final_submission
-    # save_final_submission(candidate_id, final_payload)
+    snapshot_session(st.session_state)
 
     st.success("✅ Your responses have been submitted successfully.")
     st.balloons()
@@ -1,5 +1,6 @@
 import streamlit as st
 from db.supabase_client import supabase
+from modules.scheduler import metrics as scheduler_metrics
 import json
 import pandas as pd
 from io import BytesIO
@@ -7,6 +8,18 @@ from io import BytesIO
 st.set_page_config(page_title="Admin Dashboard", layout="wide")
 st.title("📊 Admin Dashboard – Candidate Overview")
 
+if "is_admin" not in st.session_state or not st.session_state["is_admin"]:
+    st.error("⛔ Unauthorized – Please login as Admin")
+    st.stop()
+
+# Queue / capacity metrics for transcription, LLM and DB calls in this process
+with st.expander("⚙️ Backend queues (this server process)"):
+    sched = scheduler_metrics()
+    if sched:
+        st.dataframe([{"backend": name, **m} for name, m in sched.items()], width="stretch")
+    else:
+        st.caption("No transcription or evaluation calls yet.")
+
 # Fetch candidates
 response = supabase.table("candidates").select("*").execute()
 candidates = response.data if response.data else []
@@ -72,11 +85,3 @@ st.download_button(
     key="excel_export",
     help="Download candidate data in Excel format",
 )
-
-
-
-
-if "is_admin" not in st.session_state or not st.session_state["is_admin"]:
-    st.error("⛔ Unauthorized – Please login as Admin")
-    st.stop()
-
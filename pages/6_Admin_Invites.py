@@ -1,12 +1,18 @@
 import streamlit as st
-import pandas as pd
-import secrets
+import csv
+import os
 from modules.auth import create_candidate_account
 from modules.emailer import send_invite
+from modules.ingest import discard_batch, ingest_invites, iter_accepted, read_preview
+from db.queries import fetch_candidate_emails
 
 st.set_page_config(page_title="Admin – CSV Invites", layout="wide")
 st.title("📨 Admin – Upload CSV & Send Invites")
 
+if "is_admin" not in st.session_state or not st.session_state["is_admin"]:
+    st.error("⛔ Unauthorized – Please login as Admin")
+    st.stop()
+
 st.markdown("""
 ### 📌 Instructions
 - Upload a CSV file with columns: **candidate_id, name, email**
@@ -15,43 +21,103 @@ candidate_id,name,email
 C-001,Jane Doe,jane@example.com
 C-002,John Smith,john@example.com
 - If `candidate_id` is left blank, the system will auto-generate one.
-- For prototype, process **10–20 candidates at once**.
+- Emails are validated and normalized; duplicates within the file are skipped.
+- Existing candidates are skipped unless **Update existing candidates** is ticked,
+  which resets their password and login link.
 """)
 
 uploaded = st.file_uploader("Upload candidates.csv", type=["csv"])
+update_existing = st.checkbox("Update existing candidates (resets their password and login link)")
+
+RESULT_COLUMNS = ["candidate_id", "name", "email", "email_sent", "status"]
+MAX_ERRORS_SHOWN = 200
+
+
+def _offer_download(label: str, path: str, file_name: str, key: str, on_downloaded=None):
+    """Download button for a spool file; the file is only read once the admin asks for it."""
+    if not st.session_state.get(key):
+        st.button(f"📦 Prepare: {label}", key=f"{key}_prepare", on_click=lambda: st.session_state.update({key: True}))
+        return
+
+    def downloaded():
+        st.session_state[key] = False
+        if on_downloaded:
+            on_downloaded()
+
+    with open(path, "rb") as f:
+        st.download_button(f"⬇️ {label}", f, file_name=file_name, mime="text/csv", key=f"{key}_download", on_click=downloaded)
+
 
-if "invite_df" not in st.session_state:
-    st.session_state["invite_df"] = None
-
-if uploaded is not None:
-    try:
-        df = pd.read_csv(uploaded).fillna("")
-        missing_cols = [c for c in ["candidate_id", "name", "email"] if c not in df.columns]
-        if missing_cols:
-            st.error(f"❌ CSV missing required columns: {missing_cols}")
-        else:
-            def ensure_id(x):
-                return str(x).strip() if str(x).strip() else f"C-{secrets.token_hex(3).upper()}"
-            df["candidate_id"] = df["candidate_id"].apply(ensure_id)
-
-            st.session_state["invite_df"] = df
-            st.success("✅ CSV parsed successfully. Preview below:")
-            st.dataframe(df, width="stretch")
-    except Exception as e:
-        st.error(f"❌ Failed to parse CSV: {e}")
-
-if st.session_state["invite_df"] is not None:
+def _results_downloaded():
+    # The button already holds the bytes; the results file can go
+    results = st.session_state["invite_results"]
+    discard_batch(results)
+    results["results_path"] = None
+
+
+def _reset_results():
+    discard_batch(st.session_state.pop("invite_results", None))
+    st.session_state.pop("invite_rejected_dl", None)
+    st.session_state.pop("invite_results_dl", None)
+
+
+if "invite_batch" not in st.session_state:
+    st.session_state["invite_batch"] = None
+
+if uploaded is None:
+    # Upload cleared: drop the spooled batch and any previous run results
+    discard_batch(st.session_state["invite_batch"])
+    st.session_state["invite_batch"] = None
+    st.session_state.pop("invite_upload_key", None)
+    _reset_results()
+else:
+    # Parse each upload once, not on every rerun (button clicks rerun the page)
+    upload_key = (uploaded.name, uploaded.size, getattr(uploaded, "file_id", None), update_existing)
+    if st.session_state.get("invite_upload_key") != upload_key:
+        discard_batch(st.session_state["invite_batch"])
+        st.session_state["invite_batch"] = None
+        _reset_results()
+        try:
+            bar = st.progress(0.0, text="Checking existing candidates...")
+            existing = set() if update_existing else fetch_candidate_emails()
+            uploaded.seek(0)  # the same file is re-parsed when the update option changes
+            batch = ingest_invites(
+                uploaded,
+                existing_emails=existing,
+                progress=lambda frac, rows: bar.progress(frac, text=f"Parsed {rows:,} rows"),
+            )
+            bar.empty()
+            st.session_state["invite_batch"] = batch
+            st.session_state["invite_upload_key"] = upload_key
+        except Exception as e:
+            st.error(f"❌ Failed to parse CSV: {e}")
+
+batch = st.session_state["invite_batch"]
+if batch is not None:
+    st.success(f"✅ {batch['rows']:,} rows parsed: {batch['accepted']:,} ready, {batch['rejected']:,} rejected. Preview below:")
+    st.dataframe(read_preview(batch["accepted_path"]), width="stretch")
+    if batch["rejected"]:
+        with st.expander(f"⚠️ Rejected rows ({batch['rejected']:,})"):
+            st.dataframe(read_preview(batch["rejected_path"]), width="stretch")
+            _offer_download("Download rejected rows", batch["rejected_path"], "rejected_rows.csv", key="invite_rejected_dl")
+
+if batch is not None and batch["accepted"]:
+    verb = "Create/Update" if update_existing else "Create"
     col1, col2 = st.columns([1, 1])
     with col1:
-        do_create = st.button("1️⃣ Create/Update Accounts (No Emails)")
+        do_create = st.button(f"1️⃣ {verb} Accounts (No Emails)")
     with col2:
-        do_send = st.button("2️⃣ Create/Update + Send Invites")
+        do_send = st.button(f"2️⃣ {verb} Accounts + Send Invites")
 
-    results = []
     if do_create or do_send:
-        df = st.session_state["invite_df"]
-        with st.spinner("Processing candidates..."):
-            for _, row in df.iterrows():
+        # Stream per-row results to the spool; keep only counts and the first errors in memory
+        n_ok, errors, n_errors = 0, [], 0
+        results_path = os.path.join(batch["spool_dir"], "results.csv")
+        with st.spinner("Processing candidates..."), open(results_path, "w", newline="", encoding="utf-8") as out:
+            writer = csv.DictWriter(out, fieldnames=RESULT_COLUMNS)
+            writer.writeheader()
+            rows = (row for chunk in iter_accepted(batch["accepted_path"]) for _, row in chunk.iterrows())
+            for row in rows:
                 cid = str(row["candidate_id"]).strip()
                 name = str(row["name"]).strip()
                 email = str(row["email"]).strip()
@@ -66,27 +132,54 @@ if st.session_state["invite_df"] is not None:
                             password=creds["password"],
                             token=creds["token"]
                         )
-                    results.append({
+                    result = {
                         "candidate_id": creds["candidate_id"],
                         "name": name,
                         "email": email,
                         "email_sent": "Yes" if do_send else "No",
                         "status": "✅ OK"
-                    })
+                    }
+                    n_ok += 1
                 except Exception as e:
-                    results.append({
+                    result = {
                         "candidate_id": cid,
                         "name": name,
                         "email": email,
                         "email_sent": "No",
                         "status": f"❌ ERROR: {e}"
-                    })
+                    }
+                    n_errors += 1
+                    if len(errors) < MAX_ERRORS_SHOWN:
+                        errors.append(result)
+                writer.writerow(result)
 
-        st.subheader("📊 Run Results")
-        st.dataframe(pd.DataFrame(results), width="stretch")
-        st.success("✅ Done")
+        # The batch is consumed: drop its input spools but keep results.csv on disk until it is
+        # downloaded (the upload key stays so the file isn't re-parsed)
+        for path in (batch["accepted_path"], batch["rejected_path"]):
+            if os.path.exists(path):
+                os.remove(path)
+        st.session_state["invite_results"] = {
+            "spool_dir": batch["spool_dir"],
+            "results_path": results_path,
+            "ok": n_ok,
+            "errors": errors,
+            "n_errors": n_errors,
+        }
+        st.session_state["invite_batch"] = None
+        st.rerun()
 
 
-if "is_admin" not in st.session_state or not st.session_state["is_admin"]:
-    st.error("⛔ Unauthorized – Please login as Admin")
-    st.stop()
+results = st.session_state.get("invite_results")
+if results is not None:
+    st.subheader("📊 Run Results")
+    st.success(f"✅ Done – {results['ok']:,} succeeded, {results['n_errors']:,} failed.")
+    if results["errors"]:
+        shown = len(results["errors"])
+        label = f"❌ Failed rows ({results['n_errors']:,})" if shown == results["n_errors"] else f"❌ Failed rows (first {shown:,} of {results['n_errors']:,})"
+        with st.expander(label, expanded=True):
+            st.dataframe(results["errors"], width="stretch")
+    if results["results_path"]:
+        _offer_download("Download run results", results["results_path"], "invite_results.csv",
+                        key="invite_results_dl", on_downloaded=_results_downloaded)
+    else:
+        st.caption("Run results were downloaded and removed from the server.")